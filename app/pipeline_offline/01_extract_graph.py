@@ -4,15 +4,20 @@ Create citation graph (NetworkX DiGraph) from:
   • data/SSN/citation_relations.json     – optional global citation file
 Outputs:
   • indices/graph_raw.gpickle
+  • indices/abstracts.* / abstracts_ids.*   – abstract 저장소 (runtime/abstract_store.py, mmap)
 """
 
-import json, pathlib, tqdm, networkx as nx, orjson
+import json, pathlib, tqdm, networkx as nx, orjson, sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))   # app/ → runtime.*
+from runtime.abstract_store import write_abstract_store
 
 # ─────────────────────────────────────────────
 # 경로 설정 ‒ 필요하면 프로젝트 구조에 맞게 수정
 PAPER_PATH = pathlib.Path("data/SSN/papers.SSN.jsonl")
 CITE_PATH  = pathlib.Path("data/SSN/citation_relations.json")  # 없으면 무시
 OUT_PATH   = pathlib.Path("indices/graph_raw.gpickle")
+OUT_ABS    = pathlib.Path("indices/abstracts")
 OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 # ─────────────────────────────────────────────
 
@@ -66,4 +71,7 @@ with OUT_PATH.open("wb") as f:
     pickle.dump(G, f)
 
 
-print(f"✓ saved to {OUT_PATH}")
\ No newline at end of file
+# 4) abstract 저장소 – 런타임/후속 단계는 그래프 대신 이것만 읽는다 (placeholder 노드 = 빈 문자열)
+n = write_abstract_store(OUT_ABS, ((pid, d.get("abstract")) for pid, d in G.nodes(data=True)))
+
+print(f"✓ saved to {OUT_PATH}  /  {OUT_ABS}.* ({n:,} records)")
\ No newline at end of file
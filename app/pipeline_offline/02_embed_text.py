@@ -1,43 +1,30 @@
 #!/usr/bin/env python3
 """
-Step 2: embed abstract text for every node in graph_raw.gpickle
+Step 2: embed abstract text for every node (indices/abstracts.* store)
 Outputs
   • indices/text_emb.npz   –  key = paper_id, value = np.ndarray(float32, 384)
-  • indices/pid2idx.pkl    –  {paper_id: row_idx}  (후속 단계용)
+(paper row 번호는 04_concat_embed.py 의 indices/paper_ids 테이블이 정한다)
 """
-import pathlib, tqdm, networkx as nx, numpy as np, pickle, orjson
+import pathlib, tqdm, numpy as np, sys
 from sentence_transformers import SentenceTransformer
 
-GRAPH_PATH = pathlib.Path("indices/graph_raw.gpickle")
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))   # app/ → runtime.*
+from runtime.abstract_store import AbstractStore
+
+ABS_PATH   = pathlib.Path("indices/abstracts")      # 01_extract_graph.py 산출
 OUT_EMB    = pathlib.Path("indices/text_emb.npz")
-OUT_MAP    = pathlib.Path("indices/pid2idx.pkl")
 MODEL_NAME = "moka-ai/m3e-base"
 BATCH      = 512                      # GPU=2-4 GB → 512; CPU → 64 추천
 
-print("🔹 load graph …")
-with GRAPH_PATH.open("rb") as f:      # ← 변경
-    G: nx.Graph = pickle.load(f)      # ← 변경
-    
 print("🔹 collect abstract texts …")
+store = AbstractStore(ABS_PATH)
 pids, texts = [], []
-
-# collect abstract texts …
-for pid, data in G.nodes(data=True):
-    abstract = data.get("abstract") or ""
-
-    # 리스트(또는 리스트-오브-리스트) → 문자열
-    if isinstance(abstract, list):
-        if abstract and isinstance(abstract[0], list):          # [[sent1,sent2], [sent3]]
-            abstract = " ".join(sum(abstract, []))
-        else:                                         # ["sent1", "sent2", ...]
-            abstract = " ".join(abstract)
-    abstract = abstract.strip()
-
+for pid, abstract in store.items():  # 이미 평문화된 문자열
     if abstract:
         pids.append(pid)
         texts.append(abstract)
 
-print(f"  {len(texts):,} / {G.number_of_nodes():,} nodes have abstract")
+print(f"  {len(texts):,} / {len(store):,} nodes have abstract")
 
 print("🔹 load SBERT model:", MODEL_NAME)
 device_id = 0           # 0번 GPU
@@ -57,5 +44,4 @@ print("  final shape:", emb.shape)
 
 # 저장
 np.savez_compressed(OUT_EMB, **{pid: v for pid, v in zip(pids, emb)})
-pickle.dump({pid: i for i, pid in enumerate(pids)}, OUT_MAP.open("wb"))
-print(f"✓ saved → {OUT_EMB}  /  {OUT_MAP}")
+print(f"✓ saved → {OUT_EMB}")
@@ -4,21 +4,32 @@
 Merge 384-d SBERT text vectors + 128-d Node2Vec graph vectors
 Outputs
   • indices/paper_embed.npy   –  np.ndarray(float32)  [N, 512]
-  • indices/pid2idx.pkl       –  {paper_id: row_idx}
+  • indices/paper_ids.*       –  paper_id ↔ row 테이블 (runtime/id_table.py, mmap)
+  • indices/text_embed.npy    –  [N, 384] L2 정규화 텍스트 벡터, paper row 정렬
+                                  (런타임 hop-1 필터가 mmap 으로 사용, --text-dtype)
 """
-import numpy as np, joblib, pickle, pathlib, tqdm, orjson
+import numpy as np, joblib, pathlib, tqdm, orjson, sys, argparse
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))   # app/ → runtime.*
+from runtime.id_table import write_id_table
 
 TEXT_PATH  = pathlib.Path("indices/text_emb.npz")
 GRAPH_PATH = pathlib.Path("indices/graph_emb.pkl")
 OUT_VEC    = pathlib.Path("indices/paper_embed.npy")
-OUT_MAP    = pathlib.Path("indices/pid2idx.pkl")
+OUT_IDS    = pathlib.Path("indices/paper_ids")
+OUT_TEXT   = pathlib.Path("indices/text_embed.npy")
 ALPHA      = 0.7                     # 텍스트 70 %, 그래프 30 %
 
+p = argparse.ArgumentParser()
+p.add_argument("--text-dtype", default="float32", choices=["float32", "float16"],
+               help="text_embed.npy 저장 타입 (float16 → 메모리 1/2)")
+args = p.parse_args()
+
 print("🔹 load text & graph embeddings …")
 text_npz = np.load(TEXT_PATH)        # key = paper_id, value = (384,)
 graph    = joblib.load(GRAPH_PATH)   # dict {paper_id: (128,)}
 
-rows, pid2idx = [], {}
+rows, row_pids, texts = [], [], []
 for pid in tqdm.tqdm(text_npz.files, desc="merge"):
     if pid not in graph:                 # 그래프 벡터 없는 논문 skip
         continue
@@ -28,10 +39,15 @@ for pid in tqdm.tqdm(text_npz.files, desc="merge"):
     t /= np.linalg.norm(t) + 1e-9
     g /= np.linalg.norm(g) + 1e-9
     rows.append(np.concatenate([t*ALPHA, g*(1-ALPHA)]))
-    pid2idx[pid] = len(rows)-1
+    texts.append(t)
+    row_pids.append(pid)                 # row 번호 = len(rows)-1
 
 embed = np.vstack(rows).astype("float32")
 OUT_VEC.parent.mkdir(parents=True, exist_ok=True)
 np.save(OUT_VEC, embed)
-pickle.dump(pid2idx, OUT_MAP.open("wb"))
-print(f"✓ saved → {OUT_VEC} ({embed.shape})  /  {OUT_MAP}")
+np.save(OUT_TEXT, np.vstack(texts).astype(args.text_dtype))
+# 이전 06 단계의 클러스터 연속 사본은 새 row 와 정렬이 안 맞음 → 06 재실행 시 다시 생성
+for stale in ("paper_embed_clustered.npy", "text_embed_clustered.npy"):
+    pathlib.Path("indices", stale).unlink(missing_ok=True)
+write_id_table(OUT_IDS, row_pids)
+print(f"✓ saved → {OUT_VEC} ({embed.shape})  /  {OUT_TEXT}  /  {OUT_IDS}.*")
@@ -4,46 +4,63 @@ Step 6:  build cluster centroids, FAISS index, and keyword meta
 Inputs
   • indices/paper_embed.npy      – (N, 512) float32
   • indices/cluster_labels.npy   – (N,)     int32
-  • indices/pid2idx.pkl          – {paper_id: row_idx}
+  • indices/paper_ids.*          – paper_id ↔ row table (runtime/id_table.py)
   • indices/text_emb.npz         – paper_id → 384-d text vec (for TF-IDF)
 Outputs
   • indices/cluster_centroids.npy    – (C, 512) float32
-  • indices/cluster.index            – FAISS IndexFlatIP on centroids
+  • indices/cluster.index            – FAISS index on centroids (--index-type)
+  • indices/cluster_text.index       – same index type on text slice (C, 384)
   • indices/cluster_meta.json        – {cid: {size, keywords}}
+  • indices/cluster_offsets.npy      – CSR offsets (C+1,)  (see cluster_layout.py)
+  • indices/cluster_members.npy      – CSR member rows (N,)
+  • indices/*_embed_clustered.npy    – paper_embed / text_embed rows in
+                                       cluster order (slab per cluster)
 """
 import numpy as np, pickle, json, faiss, pathlib, tqdm
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sentence_transformers import SentenceTransformer, util
-import itertools, re, collections
+import itertools, re, collections, argparse
+from index_factory import add_index_args, index_from_args
+from cluster_layout import build_csr, write_csr, write_slabs, SLAB_PATHS
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))   # app/ → runtime.*
+from runtime.id_table import IdTable
+
+args = add_index_args(argparse.ArgumentParser()).parse_args()
 
 EMB_PATH   = pathlib.Path("indices/paper_embed.npy")
 LABEL_PATH = pathlib.Path("indices/cluster_labels.npy")
-PID_MAP    = pathlib.Path("indices/pid2idx.pkl")
+ID_TABLE   = pathlib.Path("indices/paper_ids")
 TEXT_PATH  = pathlib.Path("indices/text_emb.npz")
 
 OUT_CENT   = pathlib.Path("indices/cluster_centroids.npy")
 OUT_INDEX  = pathlib.Path("indices/cluster.index")
 OUT_META   = pathlib.Path("indices/cluster_meta.json")
+OUT_TEXT_INDEX = pathlib.Path("indices/cluster_text.index")
+GRAPH_DIM  = 128                                # Step 04 Node2Vec 차원
 
 # ── load ───────────────────────────────────────────────
-emb     = np.load(EMB_PATH)                     # (N, 512)
 labels  = np.load(LABEL_PATH)                   # (N,)
-pid2idx = pickle.load(PID_MAP.open("rb"))
+paper_ids = IdTable(ID_TABLE)
 text_npz= np.load(TEXT_PATH)
 
-print("🔹 group by cluster …")
-clusters = {}
-for pid, idx in pid2idx.items():
-    cid = int(labels[idx])
-    clusters.setdefault(cid, []).append(pid)
+print("🔹 group by cluster (CSR) …")
+offsets, members = build_csr(labels)
+write_csr(offsets, members)
+write_slabs(members)                            # 클러스터 연속 배치 사본
+emb = np.load(SLAB_PATHS[EMB_PATH], mmap_mode="r")   # (N, 512) slab c = off[c]:off[c+1]
 
 # ── centroid & keywords ────────────────────────────────
+# cid 순서로 추가 → FAISS 인덱스 위치 == cluster id (런타임이 검색 결과 위치를 cid 로 사용)
 centroids, meta = [], {}
 tfidf = TfidfVectorizer(stop_words="english", max_features=40_000)
 
-for cid, pids in tqdm.tqdm(clusters.items(), desc="centroid/keywords"):
-    idxs = [pid2idx[p] for p in pids]
-    cent = emb[idxs].mean(0, dtype="float32")
+for cid in tqdm.trange(len(offsets) - 1, desc="centroid/keywords"):
+    idxs = members[offsets[cid]:offsets[cid + 1]]
+    pids = paper_ids.pids(idxs)
+    cent = (emb[offsets[cid]:offsets[cid + 1]].mean(0, dtype="float32") if len(idxs)
+            else np.zeros(emb.shape[1], dtype="float32"))       # 빈 클러스터
     centroids.append(cent)
 
     # 키워드: 클러스터 논문의 abstract 텍스트로 TF-IDF
@@ -62,10 +79,22 @@ for cid, pids in tqdm.tqdm(clusters.items(), desc="centroid/keywords"):
 centroids = np.vstack(centroids).astype("float32")
 np.save(OUT_CENT, centroids)
 
-index = faiss.IndexFlatIP(centroids.shape[1])
-index.add(centroids)
+index = index_from_args(centroids, args)
 faiss.write_index(index, str(OUT_INDEX))
 
+# 런타임 쿼리는 그래프 부분이 0벡터 → 텍스트 slice 내적만으로 동일 순위/점수
+cent_txt = np.ascontiguousarray(centroids[:, :-GRAPH_DIM])
+text_index = index_from_args(cent_txt, args)
+faiss.write_index(text_index, str(OUT_TEXT_INDEX))
+
 json.dump(meta, OUT_META.open("w"))
-print("✓ centroids:", centroids.shape,
+
+# m3e 버전이 남긴 키워드 임베딩은 이 meta 와 정렬이 안 맞음 → 제거 (런타임은 encode 로 폴백)
+for stale in ("cluster_kw_emb.npy", "cluster_kw_offsets.npy"):
+    pathlib.Path("indices", stale).unlink(missing_ok=True)
+# 07_precompute_trees.py 산출물도 이전 meta 기준 → 제거 (다시 실행할 것)
+for stale in pathlib.Path("indices").glob("cluster_trees_d*"):
+    stale.unlink()
+
+print("✓ centroids:", centroids.shape, f"/ {args.index_type} index",
       "/ index & meta saved to indices/")
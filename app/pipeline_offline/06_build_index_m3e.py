@@ -2,43 +2,61 @@
 """
 Step 6 (m3e version): build centroids, FAISS index, and
 semantic keywords per cluster.
+Index type is selectable (see index_factory.py):
+  python 06_build_index_m3e.py --index-type hnsw
+Also writes the cluster membership CSR (cluster_offsets / cluster_members,
+see cluster_layout.py) and cluster-contiguous copies of paper_embed /
+text_embed; centroids are stored in cluster-id order.
+Keyword embeddings are kept for the runtime:
+  • indices/cluster_kw_emb.npy      – (K, D) float32, L2-normalized
+  • indices/cluster_kw_offsets.npy  – (C+1,) int64; rows off[c]:off[c+1]
+                                       align with meta[c]["keywords"]
 """
-import numpy as np, pickle, json, faiss, pathlib, tqdm, re, itertools, collections
+import numpy as np, json, faiss, pathlib, tqdm, re, itertools, collections
 from sentence_transformers import SentenceTransformer, util
-import torch, networkx as nx
+import torch, argparse
+from index_factory import add_index_args, index_from_args
+from cluster_layout import build_csr, write_csr, write_slabs, SLAB_PATHS
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))   # app/ → runtime.*
+from runtime.id_table import IdTable
+from runtime.abstract_store import AbstractStore
+
+args = add_index_args(argparse.ArgumentParser()).parse_args()
 
 # ───────── 경로 ─────────
 EMB_PATH   = pathlib.Path("indices/paper_embed.npy")
 LABEL_PATH = pathlib.Path("indices/cluster_labels.npy")
-PID_MAP    = pathlib.Path("indices/pid2idx.pkl")
-GRAPH_PATH = pathlib.Path("indices/graph_raw.gpickle")
+ID_TABLE   = pathlib.Path("indices/paper_ids")
+ABS_PATH   = pathlib.Path("indices/abstracts")
 
 OUT_CENT   = pathlib.Path("indices/cluster_centroids.npy")
 OUT_INDEX  = pathlib.Path("indices/cluster.index")
 OUT_META   = pathlib.Path("indices/cluster_meta.json")
+OUT_TEXT_INDEX = pathlib.Path("indices/cluster_text.index")   # 텍스트 slice 전용
+OUT_KW_EMB = pathlib.Path("indices/cluster_kw_emb.npy")
+OUT_KW_OFF = pathlib.Path("indices/cluster_kw_offsets.npy")
+GRAPH_DIM  = 128                                # Step 04 Node2Vec 차원
 
 # ───────── 로드 ─────────
-emb      = np.load(EMB_PATH).astype("float32")           # (N,512)
 labels   = np.load(LABEL_PATH)
-pid2idx  = pickle.load(PID_MAP.open("rb"))
-with open(GRAPH_PATH, "rb") as f:
-    G: nx.DiGraph = pickle.load(f)
+paper_ids = IdTable(ID_TABLE)
+abstracts = AbstractStore(ABS_PATH)
 
-# cluster → pids
-clusters = {}
-for pid, idx in pid2idx.items():
-    clusters.setdefault(int(labels[idx]), []).append(pid)
+# cluster → paper rows (CSR)
+offsets, members = build_csr(labels)
+write_csr(offsets, members)
+write_slabs(members)                                     # 클러스터 연속 배치 사본
+emb = np.load(SLAB_PATHS[EMB_PATH], mmap_mode="r")       # (N,512) slab c = off[c]:off[c+1]
 
 # ───────── m3e 모델 ─────────
 model = SentenceTransformer('moka-ai/m3e-base', device="cuda:0")
 TOKEN  = re.compile(r"[a-zA-Z가-힣0-9\-]{2,}")   # 2+ 글자 토큰
 
 def _abs(pid):
-    """abstract 문자열 안전 추출"""
-    a = G.nodes[pid].get("abstract", "")
-    if isinstance(a, list):
-        a = " ".join(map(str, a))
-    return str(a)
+    """abstract 문자열 (그래프에 없는 논문이면 빈 문자열)"""
+    return abstracts.get(pid, "")
 
 def extract_ngram(txt, max_n=3):
     ws = TOKEN.findall(txt.lower())
@@ -47,28 +65,36 @@ def extract_ngram(txt, max_n=3):
             yield " ".join(ws[i:i + n])
 
 def semantic_keywords(pids, centroid_txt, top_n=8):
+    """→ (keywords, 정규화 임베딩 (len, D))"""
     docs = [_abs(p) for p in pids]
     # 후보 n-gram 수집 & 빈도 필터
     cand = (c for d in docs for c in extract_ngram(d))
     counts = collections.Counter(itertools.islice(cand, 0, 40000))
     cand = [w for w, c in counts.items() if c >= 2 and len(w) <= 40][:10000]
     if not cand:
-        return []
+        return [], np.zeros((0, model.get_sentence_embedding_dimension()), "float32")
     # 임베딩 & cosine sim
     emb_cand = model.encode(cand, batch_size=256, normalize_embeddings=True)
     sim = util.cos_sim(torch.tensor(centroid_txt), emb_cand)[0].cpu().numpy()
-    return [c for c, _ in sorted(zip(cand, sim), key=lambda x: x[1], reverse=True)[:top_n]]
+    top = sorted(range(len(cand)), key=lambda i: sim[i], reverse=True)[:top_n]
+    return [cand[i] for i in top], emb_cand[top].astype("float32")
 
 # ───────── centroid + keywords ─────────
+# cid 순서로 추가 → FAISS 인덱스 위치 == cluster id
 centroids, meta = [], {}
-for cid, pids in tqdm.tqdm(clusters.items(), desc="centroid/keywords"):
-    idxs = [pid2idx[p] for p in pids]
-    cent = emb[idxs].mean(0)                       # (512,)
+kw_embs, kw_off = [], [0]
+for cid in tqdm.trange(len(offsets) - 1, desc="centroid/keywords"):
+    idxs = members[offsets[cid]:offsets[cid + 1]]
+    pids = paper_ids.pids(idxs)
+    cent = (emb[offsets[cid]:offsets[cid + 1]].mean(0, dtype="float32")   # (512,)
+            if len(idxs) else np.zeros(emb.shape[1], dtype="float32"))
     centroids.append(cent.astype("float32"))
 
     # 텍스트 384-d 부분만 사용하여 키워드 추출
-    cent_txt = cent[:-128] / (np.linalg.norm(cent[:-128]) + 1e-9)
-    kws = semantic_keywords(pids, cent_txt)
+    cent_txt = cent[:-GRAPH_DIM] / (np.linalg.norm(cent[:-GRAPH_DIM]) + 1e-9)
+    kws, embs = semantic_keywords(pids, cent_txt)
+    kw_embs.append(embs)
+    kw_off.append(kw_off[-1] + len(kws))
 
     meta[cid] = {"size": len(pids), "keywords": kws}
 
@@ -76,9 +102,21 @@ for cid, pids in tqdm.tqdm(clusters.items(), desc="centroid/keywords"):
 cent = np.vstack(centroids).astype("float32")
 np.save(OUT_CENT, cent)
 
-index = faiss.IndexFlatIP(cent.shape[1])
-index.add(cent)
+index = index_from_args(cent, args)
 faiss.write_index(index, str(OUT_INDEX))
 
+# 런타임 쿼리는 그래프 부분이 0벡터 → 텍스트 slice 내적만으로 동일 순위/점수
+cent_txt = np.ascontiguousarray(cent[:, :-GRAPH_DIM])
+text_index = index_from_args(cent_txt, args)
+faiss.write_index(text_index, str(OUT_TEXT_INDEX))
+
+# 런타임 키워드 점수 계산용 – meta[cid]["keywords"] 와 행 정렬
+np.save(OUT_KW_EMB, np.vstack(kw_embs).astype("float32"))
+np.save(OUT_KW_OFF, np.asarray(kw_off, dtype="int64"))
+
 json.dump(meta, OUT_META.open("w"))
-print("✓ Saved:", OUT_CENT, OUT_INDEX, OUT_META)
+
+# 07_precompute_trees.py 산출물은 이전 meta 기준 → 제거 (다시 실행할 것)
+for stale in pathlib.Path("indices").glob("cluster_trees_d*"):
+    stale.unlink()
+print("✓ Saved:", OUT_CENT, OUT_INDEX, OUT_TEXT_INDEX, OUT_META, OUT_KW_EMB)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# pipeline_offline/07_precompute_trees.py
+"""
+Step 7: precompute per-cluster keyword trees for the runtime
+/inference 의 트리는 root_kw = meta[cid]["keywords"][0] 로 고정 → cid, depth 에만 의존
+Inputs  (06_build_index*.py 이후의 indices/ 전체)
+Outputs
+  • indices/cluster_trees_d{depth}.*  – cid 순 트리 JSON (runtime/tree_store.py, mmap)
+      python 07_precompute_trees.py --depths 1 2
+"""
+import argparse, pathlib, sys, time, tqdm
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))   # app/ → runtime.*
+from runtime.artifacts import IDX_DIR
+from runtime.cluster_searcher import meta
+from runtime.graph_builder import build_tree
+from runtime.tree_store import tree_store_prefix, write_tree_store
+
+p = argparse.ArgumentParser()
+p.add_argument("--depths", nargs="+", type=int, default=[1, 2], choices=[1, 2])
+args = p.parse_args()
+
+n_clusters = len(meta())
+
+
+def trees(depth):
+    for cid in tqdm.trange(n_clusters, desc=f"trees d{depth}"):
+        kws = meta()[str(cid)]["keywords"]
+        yield build_tree(kws[0], cid, depth=depth) if kws else None   # 빈 클러스터
+
+
+for depth in args.depths:
+    t0 = time.perf_counter()
+    prefix = tree_store_prefix(IDX_DIR, depth)
+    n = write_tree_store(prefix, trees(depth))
+    print(f"✓ depth {depth}: {n} trees → {prefix}.*  ({time.perf_counter() - t0:.1f}s)")
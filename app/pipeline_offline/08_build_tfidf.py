@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# pipeline_offline/08_build_tfidf.py
+"""
+Step 8: corpus-wide TF-IDF + cluster × term sum matrix (runtime keyword extraction)
+Inputs
+  • indices/paper_ids.*             – paper row 순서 (04_concat_embed.py)
+  • indices/abstracts.*             – abstract 저장소 (01_extract_graph.py)
+  • indices/cluster_offsets/members – CSR (06_build_index*.py)
+Outputs  (runtime/sparse_store.py, mmap)
+  • indices/tfidf_docs.*            – [N, V] paper row × term TF-IDF (float32)
+  • indices/cluster_terms.*         – [C, V] = 멤버십 indicator [C, N] @ tfidf_docs
+  • indices/tfidf_vocab.*           – term 문자열 (열 순서, runtime/blob_store.py)
+런타임 top_keywords 는 fit 없이 희소 행 1개 argpartition 만 수행
+"""
+import numpy as np, scipy.sparse as sp, pathlib, sys, time
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))   # app/ → runtime.*
+from runtime.abstract_store import AbstractStore
+from runtime.blob_store import write_blob_store
+from runtime.id_table import IdTable
+from runtime.sparse_store import save_csr
+from cluster_layout import OUT_OFFSETS, OUT_MEMBERS
+
+ID_TABLE  = pathlib.Path("indices/paper_ids")
+ABS_PATH  = pathlib.Path("indices/abstracts")
+OUT_DOCS  = pathlib.Path("indices/tfidf_docs")
+OUT_CT    = pathlib.Path("indices/cluster_terms")
+OUT_VOCAB = pathlib.Path("indices/tfidf_vocab")
+
+# runtime/graph_builder.py 의 per-call 벡터라이저와 같은 설정
+tfidf = TfidfVectorizer(
+    stop_words="english",
+    token_pattern=r"(?u)\b[a-zA-Z]{2,}\b",   # 2글자↑ 영문 단어
+    max_features=40_000,
+    dtype=np.float32,
+)
+
+t0 = time.perf_counter()
+ids       = IdTable(ID_TABLE)
+abstracts = AbstractStore(ABS_PATH)
+docs = (abstracts.get(ids.pid(r), "") for r in range(len(ids)))        # paper row 순
+X = tfidf.fit_transform(docs).tocsr()                                  # (N, V)
+print(f"🔹 tfidf: {X.shape} nnz={X.nnz:,}  ({time.perf_counter() - t0:.1f}s)")
+
+# 클러스터 indicator [C, N] 는 CSR 그 자체: indptr = offsets, indices = members
+offsets, members = np.load(OUT_OFFSETS), np.load(OUT_MEMBERS)
+ind = sp.csr_matrix((np.ones(len(members), dtype=np.float32), members, offsets),
+                    shape=(len(offsets) - 1, X.shape[0]))
+CT  = (ind @ X).tocsr()                                                # (C, V)
+
+save_csr(OUT_DOCS, X)
+save_csr(OUT_CT, CT)
+write_blob_store(OUT_VOCAB, tfidf.get_feature_names_out())
+print(f"✓ saved → {OUT_DOCS}.* / {OUT_CT}.* {CT.shape} / {OUT_VOCAB}.*")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# pipeline_offline/09_build_kw_postings.py
+"""
+Step 9: cluster keyword → paper postings (word-boundary 포함 여부)
+클러스터마다 meta 키워드 전체로 Aho–Corasick 매처를 만들고 멤버 abstract 를 1회씩 스캔
+(runtime/kw_matcher.py – contains_kw 와 같은 판정)
+Inputs
+  • indices/cluster_meta.json, cluster_offsets/members, paper_ids.*, abstracts.*
+Outputs
+  • indices/kw_postings.*          – CSR [K, N] (runtime/sparse_store.py)
+                                      행 k = (cid, 키워드) 평탄화, 열 = paper row
+  • indices/kw_postings_offsets.npy – int64 [C+1]  cluster c 의 키워드 행 = off[c]:off[c+1]
+                                      (meta[c]["keywords"] 순서와 정렬)
+"""
+import numpy as np, scipy.sparse as sp, json, pathlib, sys, tqdm
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))   # app/ → runtime.*
+from runtime.abstract_store import AbstractStore
+from runtime.id_table import IdTable
+from runtime.kw_matcher import KeywordMatcher
+from runtime.sparse_store import save_csr
+from cluster_layout import OUT_OFFSETS, OUT_MEMBERS
+
+META_PATH = pathlib.Path("indices/cluster_meta.json")
+ID_TABLE  = pathlib.Path("indices/paper_ids")
+ABS_PATH  = pathlib.Path("indices/abstracts")
+OUT_POST  = pathlib.Path("indices/kw_postings")
+OUT_OFF   = pathlib.Path("indices/kw_postings_offsets.npy")
+
+meta      = json.load(META_PATH.open())
+offsets, members = np.load(OUT_OFFSETS), np.load(OUT_MEMBERS)
+ids       = IdTable(ID_TABLE)
+abstracts = AbstractStore(ABS_PATH)
+
+indptr, cols, kw_off = [0], [], [0]
+for cid in tqdm.trange(len(offsets) - 1, desc="postings"):
+    kws  = meta[str(cid)]["keywords"]
+    rows = members[offsets[cid]:offsets[cid + 1]]
+    post = KeywordMatcher(kws).postings(
+        (int(r), abstracts.get(ids.pid(r), "")) for r in rows)
+    for kw in kws:                                  # meta 순서 그대로 (대소문자 중복도 행 유지)
+        hit = post.get(kw.lower(), [])
+        cols.extend(hit)
+        indptr.append(len(cols))
+    kw_off.append(kw_off[-1] + len(kws))
+
+P = sp.csr_matrix((np.ones(len(cols), dtype=np.uint8),
+                   np.asarray(cols, dtype=np.int32),
+                   np.asarray(indptr, dtype=np.int64)),
+                  shape=(len(indptr) - 1, len(ids)))
+save_csr(OUT_POST, P)
+np.save(OUT_OFF, np.asarray(kw_off, dtype="int64"))
+print(f"✓ saved → {OUT_POST}.* {P.shape} nnz={P.nnz:,} / {OUT_OFF}")
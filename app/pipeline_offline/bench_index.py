@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+FAISS 인덱스 타입별 recall@k / 검색 지연 / 메모리 벤치마크
+  • 기준(정답) = IndexFlatIP 결과
+  • 지연시간은 런타임과 같이 쿼리 1개씩 search → p50 / p99
+사용 예
+  python pipeline_offline/bench_index.py                       # cluster centroids 텍스트 slice
+  python pipeline_offline/bench_index.py --synthetic 1000000   # 규모 확장 시뮬레이션
+"""
+import argparse, pathlib, time
+import faiss, numpy as np
+from index_factory import INDEX_TYPES, add_index_args, build_index
+
+p = argparse.ArgumentParser()
+p.add_argument("--vecs", default="indices/cluster_centroids.npy")
+p.add_argument("--graph-dim", type=int, default=128,
+               help="뒤쪽 그래프 차원 제거 (0 이면 전체 사용)")
+p.add_argument("--synthetic", type=int, default=0,
+               help="N>0 이면 --vecs 대신 N×d 랜덤 단위벡터 사용")
+p.add_argument("--dim", type=int, default=384, help="--synthetic 차원")
+p.add_argument("--queries", type=int, default=1000)
+p.add_argument("-k", type=int, default=10)
+p.add_argument("--types", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES)
+add_index_args(p)
+args = p.parse_args()
+
+rng = np.random.default_rng(0)
+
+def unit(x):
+    return (x / (np.linalg.norm(x, axis=1, keepdims=True) + 1e-9)).astype("float32")
+
+# ── 데이터 ──────────────────────────────────────
+if args.synthetic:
+    xb = unit(rng.standard_normal((args.synthetic, args.dim), dtype="float32"))
+else:
+    xb = np.load(pathlib.Path(args.vecs)).astype("float32")
+    if args.graph_dim:
+        xb = xb[:, :-args.graph_dim]
+    xb = np.ascontiguousarray(xb)
+
+# 쿼리: DB 벡터 + 노이즈 (실제 쿼리처럼 정답 근처지만 동일하진 않음)
+sel = rng.choice(len(xb), size=min(args.queries, len(xb)), replace=False)
+xq  = unit(unit(xb[sel]) + 0.3 * unit(rng.standard_normal((len(sel), xb.shape[1]),
+                                                           dtype="float32")))
+k   = min(args.k, len(xb))
+print(f"🔹 db={xb.shape}  queries={len(xq)}  k={k}")
+
+_, I_true = build_index(xb, "flat").search(xq, k)
+
+
+def bench(kind):
+    t0 = time.perf_counter()
+    index = build_index(xb, kind,
+                        nlist=args.nlist, nprobe=args.nprobe,
+                        hnsw_m=args.hnsw_m, ef_construction=args.ef_construction,
+                        ef_search=args.ef_search,
+                        pq_m=args.pq_m, pq_bits=args.pq_bits)
+    t_build = time.perf_counter() - t0
+
+    lat, hits = [], 0
+    for i in range(len(xq)):
+        t0 = time.perf_counter()
+        _, I = index.search(xq[i:i + 1], k)
+        lat.append((time.perf_counter() - t0) * 1000.0)
+        hits += len(np.intersect1d(I[0], I_true[i]))
+
+    mem_mb = faiss.serialize_index(index).nbytes / 2**20
+    return {
+        "type":      kind,
+        "recall":    hits / (len(xq) * k),
+        "p50_ms":    float(np.percentile(lat, 50)),
+        "p99_ms":    float(np.percentile(lat, 99)),
+        "mem_mb":    mem_mb,
+        "build_s":   t_build,
+    }
+
+
+faiss.omp_set_num_threads(1)            # 단일 쿼리 지연 측정 → 스레드 고정
+rows = [bench(t) for t in args.types]
+
+print(f"\n{'type':<7}{'recall@'+str(k):>10}{'p50 ms':>10}{'p99 ms':>10}"
+      f"{'mem MB':>10}{'build s':>10}")
+for r in rows:
+    print(f"{r['type']:<7}{r['recall']:>10.4f}{r['p50_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+          f"{r['mem_mb']:>10.1f}{r['build_s']:>10.1f}")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# pipeline_offline/cluster_layout.py
+"""
+클러스터 멤버십 CSR 레이아웃 (06_build_index*.py 공용)
+
+  • indices/cluster_offsets.npy  – int64 [C+1]  클러스터 c 의 멤버 = members[off[c]:off[c+1]]
+  • indices/cluster_members.npy  – int32 [N]    paper row 번호, cluster id 순 정렬(안정)
+
+런타임은 두 파일을 mmap 으로 열어 슬라이스만 하므로 복사/재구성 비용이 없다.
+
+클러스터 연속 배치 (slab) 행렬 – 위치 i 의 행 = 원본 row members[i]
+  • indices/paper_embed_clustered.npy  – paper_embed.npy 재배치 (N, 512)
+  • indices/text_embed_clustered.npy   – text_embed.npy  재배치 (N, 384)
+  → 클러스터 c 의 벡터 = X[off[c]:off[c+1]] (연속 1구간, gather 없음)
+"""
+import pathlib
+import numpy as np
+
+OUT_OFFSETS = pathlib.Path("indices/cluster_offsets.npy")
+OUT_MEMBERS = pathlib.Path("indices/cluster_members.npy")
+
+# 원본 행렬 → 클러스터 연속 배치 사본
+SLAB_PATHS = {
+    pathlib.Path("indices/paper_embed.npy"): pathlib.Path("indices/paper_embed_clustered.npy"),
+    pathlib.Path("indices/text_embed.npy"):  pathlib.Path("indices/text_embed_clustered.npy"),
+}
+CHUNK_ROWS = 65_536                 # 재배치 시 한 번에 옮기는 행 수 (메모리 상한)
+
+
+def build_csr(labels: np.ndarray, n_clusters: int = 0):
+    """labels[N] → (offsets[C+1], members[N])"""
+    labels = np.asarray(labels).astype("int64")
+    n_clusters = max(n_clusters, int(labels.max()) + 1 if len(labels) else 0)
+
+    members = np.argsort(labels, kind="stable").astype("int32")
+    counts  = np.bincount(labels, minlength=n_clusters)
+    offsets = np.zeros(n_clusters + 1, dtype="int64")
+    np.cumsum(counts, out=offsets[1:])
+    return offsets, members
+
+
+def write_csr(offsets: np.ndarray, members: np.ndarray):
+    OUT_OFFSETS.parent.mkdir(parents=True, exist_ok=True)
+    np.save(OUT_OFFSETS, offsets)
+    np.save(OUT_MEMBERS, members)
+
+
+def write_clustered(src, dst, members: np.ndarray, chunk: int = CHUNK_ROWS):
+    """src (N, D) 행렬을 members 순서로 재배치해 dst 에 저장 (mmap → mmap, 청크 단위)"""
+    X   = np.load(src, mmap_mode="r")
+    out = np.lib.format.open_memmap(dst, mode="w+", dtype=X.dtype,
+                                    shape=(len(members),) + X.shape[1:])
+    for s in range(0, len(members), chunk):
+        out[s:s + chunk] = X[members[s:s + chunk]]   # 클러스터 안은 row 오름차순 → 순차 읽기
+    out.flush()
+    del out
+
+
+def write_slabs(members: np.ndarray) -> dict:
+    """존재하는 원본 행렬마다 slab 사본 작성 → {원본: 사본}"""
+    done = {}
+    for src, dst in SLAB_PATHS.items():
+        if src.exists():
+            write_clustered(src, dst, members)
+            done[src] = dst
+        else:
+            dst.unlink(missing_ok=True)              # 원본 없는 옛 사본은 정렬이 안 맞음
+    return done
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# pipeline_offline/index_factory.py
+"""
+FAISS inner-product 인덱스 팩토리 (06_build_index*.py / bench_index.py 공용)
+
+  flat    – IndexFlatIP (정확, 기본값)
+  ivf     – IVF-Flat            : nlist
+  hnsw    – HNSW-Flat           : M, efConstruction, efSearch
+  ivfpq   – IVF-PQ              : nlist, pq_m, pq_bits
+
+모든 인덱스는 inner-product metric (정규화 벡터면 내적 = cosine).
+"""
+import math
+import faiss, numpy as np
+
+INDEX_TYPES = ("flat", "ivf", "hnsw", "ivfpq")
+
+
+def add_index_args(p):
+    """argparse 파서에 인덱스 옵션 추가"""
+    p.add_argument("--index-type", default="flat", choices=INDEX_TYPES)
+    p.add_argument("--nlist", type=int, default=0,
+                   help="IVF 리스트 수 (0 → 4·√N)")
+    p.add_argument("--nprobe", type=int, default=16,
+                   help="IVF 검색 시 방문할 리스트 수")
+    p.add_argument("--hnsw-m", type=int, default=32)
+    p.add_argument("--ef-construction", type=int, default=200)
+    p.add_argument("--ef-search", type=int, default=64)
+    p.add_argument("--pq-m", type=int, default=0,
+                   help="PQ 서브벡터 수 (0 → d/8 이하 최대 약수)")
+    p.add_argument("--pq-bits", type=int, default=8)
+    return p
+
+
+def _default_nlist(n: int) -> int:
+    # 학습 샘플이 리스트당 ≥ 39개는 되도록 제한
+    return max(1, min(int(4 * math.sqrt(n)), n // 39 or 1))
+
+
+def _default_pq_m(d: int) -> int:
+    return max(m for m in range(1, d // 8 + 1) if d % m == 0)
+
+
+def build_index(vecs: np.ndarray, index_type: str = "flat",
+                nlist: int = 0, nprobe: int = 16,
+                hnsw_m: int = 32, ef_construction: int = 200, ef_search: int = 64,
+                pq_m: int = 0, pq_bits: int = 8):
+    """(N, d) float32 → 학습 + add 까지 끝난 FAISS 인덱스"""
+    vecs = np.ascontiguousarray(vecs, dtype="float32")
+    n, d = vecs.shape
+    ip   = faiss.METRIC_INNER_PRODUCT
+
+    if index_type == "flat":
+        index = faiss.IndexFlatIP(d)
+
+    elif index_type == "ivf":
+        nlist = nlist or _default_nlist(n)
+        index = faiss.IndexIVFFlat(faiss.IndexFlatIP(d), d, nlist, ip)
+
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(d, hnsw_m, ip)
+        index.hnsw.efConstruction = ef_construction
+
+    elif index_type == "ivfpq":
+        nlist = nlist or _default_nlist(n)
+        pq_m  = pq_m or _default_pq_m(d)
+        if d % pq_m:
+            raise ValueError(f"pq_m={pq_m} must divide d={d}")
+        # PQ 코드북 학습에는 2^bits 개 이상의 샘플 필요
+        pq_bits = min(pq_bits, max(1, int(math.log2(n))))
+        index = faiss.IndexIVFPQ(faiss.IndexFlatIP(d), d, nlist, pq_m, pq_bits, ip)
+
+    else:
+        raise ValueError(f"unknown index type: {index_type!r} "
+                         f"(choose from {', '.join(INDEX_TYPES)})")
+
+    if not index.is_trained:
+        index.train(vecs)
+    index.add(vecs)
+    set_search_params(index, nprobe=nprobe, ef_search=ef_search)
+    return index
+
+
+def set_search_params(index, nprobe: int = 16, ef_search: int = 64):
+    """검색 시 파라미터 (IVF nprobe / HNSW efSearch) 설정 – 해당 없으면 무시"""
+    ps = faiss.ParameterSpace()
+    if faiss.try_extract_index_ivf(index) is not None:
+        ps.set_index_parameter(index, "nprobe", nprobe)
+    if isinstance(index, faiss.IndexHNSW):
+        ps.set_index_parameter(index, "efSearch", ef_search)
+    return index
+
+
+def index_from_args(vecs: np.ndarray, args):
+    return build_index(vecs, args.index_type,
+                       nlist=args.nlist, nprobe=args.nprobe,
+                       hnsw_m=args.hnsw_m, ef_construction=args.ef_construction,
+                       ef_search=args.ef_search,
+                       pq_m=args.pq_m, pq_bits=args.pq_bits)
@@ -1,8 +1,10 @@
-import numpy as np, pickle
-E  = np.load("indices/text_emb.npz")
-mp = pickle.load(open("indices/pid2idx.pkl","rb"))
+import numpy as np, sys
+sys.path.insert(0, ".")                   # app/ 에서 실행
+from runtime.id_table import IdTable
+E   = np.load("indices/text_emb.npz")
+ids = IdTable("indices/paper_ids")        # 04_concat_embed.py 산출
 sample_pid = list(E.files)[0]
 print(sample_pid, E[sample_pid][:5])      # 길이 384 벡터 확인
-print("pid2idx size =", len(mp))
+print("paper_ids size =", len(ids), "/ row of sample =", ids.row(sample_pid))
 
 
@@ -0,0 +1,70 @@
+# runtime/abstract_store.py
+"""
+논문 abstract 저장소 (01_extract_graph.py 산출, networkx 그래프 unpickle 대체)
+
+  indices/abstracts.blob / .offsets.npy    – 레코드 r = 그래프 노드 r 의 abstract (UTF-8, 평문화)
+  indices/abstracts_ids.*                  – paper_id ↔ 레코드 row (runtime/id_table.py)
+
+둘 다 mmap → 파이썬 객체 없이 필요한 abstract 만 디코드.
+"""
+import pathlib
+
+from runtime.blob_store import BlobStore, blob_store_exists, write_blob_store
+from runtime.id_table import IdTable, id_table_exists, write_id_table
+
+
+def _ids_prefix(prefix):
+    prefix = pathlib.Path(prefix)
+    return prefix.with_name(prefix.name + "_ids")
+
+
+def as_text(x) -> str:
+    """abstract 필드 (str | [str] | [[str]] | None) → 한 줄 문자열"""
+    if x is None:
+        return ""
+    if isinstance(x, list):
+        if x and isinstance(x[0], list):                           # [[sent1,sent2], [sent3]]
+            x = sum(x, [])
+        return " ".join(map(str, x)).strip()
+    return str(x).strip()
+
+
+def write_abstract_store(prefix, items) -> int:
+    """items = (paper_id, abstract) 반복자 → 파일 5개, 레코드 수 반환"""
+    pids = []
+
+    def texts():
+        for pid, text in items:
+            pids.append(pid)
+            yield as_text(text)
+
+    n = write_blob_store(prefix, texts())
+    write_id_table(_ids_prefix(prefix), pids)
+    return n
+
+
+def abstract_store_exists(prefix) -> bool:
+    return blob_store_exists(prefix) and id_table_exists(_ids_prefix(prefix))
+
+
+class AbstractStore:
+    def __init__(self, prefix):
+        self._store = BlobStore(prefix)
+        self.ids    = IdTable(_ids_prefix(prefix))
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, pid: str, default=None):
+        """paper_id → abstract (그래프에 없는 논문이면 default)"""
+        r = self.ids.row(pid)
+        return default if r is None else self._store[r]
+
+    def texts(self, pids) -> list:
+        """없는 pid 는 None"""
+        return [self.get(p) for p in pids]
+
+    def items(self):
+        """(paper_id, abstract) – 레코드 순"""
+        for r in range(len(self)):
+            yield self.ids.pid(r), self._store[r]
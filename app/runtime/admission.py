@@ -0,0 +1,130 @@
+# runtime/admission.py
+"""
+추론 전용 executor + 입장 제어 (load shedding)
+
+async 핸들러는 무거운 작업(encode / FAISS / build_tree)을 이 executor 로 넘기고
+이벤트 루프는 바로 다음 요청을 받는다. 실행 중 + 대기 중 작업이 한도를 넘으면
+큐에 쌓아 타임아웃 나게 두는 대신 즉시 Overloaded → 503 + Retry-After.
+
+  • run(fn)              – 입장 + 워커 실행을 한 번에 (요청 전체가 한 작업일 때)
+  • acquire() / slot()   – 요청 단위 입장권 (Slot) 만 잡음. 그 안의 무거운 단계는
+                           slot.call(fn) 으로 워커에 넘기고, 마이크로 배처 대기처럼 워커가
+                           필요 없는 단계는 이벤트 루프에서 기다린다 (배치 크기가 워커 수에
+                           묶이지 않음). 클라이언트가 끊겨도 실행 중인 call 이 끝날 때 반환.
+
+  • INFER_WORKERS      – 동시에 실행할 추론 작업 수
+  • INFER_MAX_QUEUE    – 워커가 빌 때까지 기다릴 수 있는 작업 수
+  • INFER_RETRY_AFTER  – 거절 시 Retry-After (초)
+"""
+import asyncio, os, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+INFER_WORKERS     = int(os.getenv("INFER_WORKERS", "4"))
+INFER_MAX_QUEUE   = int(os.getenv("INFER_MAX_QUEUE", "32"))
+INFER_RETRY_AFTER = int(os.getenv("INFER_RETRY_AFTER", "1"))
+
+
+class Overloaded(Exception):
+    """대기열이 가득 참 – 호출자는 Retry-After 후 재시도"""
+
+
+class Slot:
+    """acquire() 로 받은 요청 1건의 입장권"""
+
+    def __init__(self, executor: "AdmissionExecutor"):
+        self._ex      = executor
+        self._pending = None               # 마지막 call 의 워커 future
+
+    async def call(self, fn, *args):
+        """fn(*args) 를 추론 워커로 (입장 검사 없음)"""
+        self._pending = self._ex._submit(fn, args)
+        return await asyncio.wrap_future(self._pending)
+
+    def release(self):
+        """입장권 반환 – call 이 아직 워커에서 돌고 있으면 (취소 등) 그 작업이 끝날 때"""
+        if self._pending is not None:
+            self._pending.add_done_callback(self._ex._release)
+        else:
+            self._ex._release()
+
+
+class AdmissionExecutor:
+    def __init__(self, workers: int = INFER_WORKERS,
+                 max_queue: int = INFER_MAX_QUEUE):
+        self.workers   = max(1, int(workers))
+        self.max_queue = max(0, int(max_queue))
+        self._pool     = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix="inference")
+        self._lock     = threading.Lock()
+        self._pending  = 0                 # 입장한 요청 (실행 중 + 대기 중)
+
+        # ── 카운터 ──────────────────────────
+        self.n_admitted  = 0
+        self.n_rejected  = 0
+        self.n_running   = 0
+        self.n_started   = 0
+        self.wait_ms_sum = 0.0
+        self.wait_ms_max = 0.0
+
+    # ── public ──────────────────────────────
+    def acquire(self) -> Slot:
+        """요청 1건 입장 – 한도 초과면 Overloaded. 끝나면 slot.release()"""
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.n_rejected += 1
+                raise Overloaded()
+            self._pending  += 1
+            self.n_admitted += 1
+        return Slot(self)
+
+    def _release(self, _fut=None):
+        with self._lock:
+            self._pending -= 1
+
+    @contextmanager
+    def slot(self):
+        slot = self.acquire()
+        try:
+            yield slot
+        finally:
+            slot.release()
+
+    async def run(self, fn, *args):
+        """fn(*args) 를 추론 워커에서 실행, 한도 초과면 Overloaded"""
+        self.acquire()
+        # 끝나거나 (클라이언트가 끊겨) 시작 전에 취소될 때 한 번만 반환
+        fut = self._submit(fn, args)
+        fut.add_done_callback(self._release)
+        return await asyncio.wrap_future(fut)
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = self.n_started
+            return {
+                "workers":     self.workers,
+                "max_queue":   self.max_queue,
+                "in_flight":   self.n_running,
+                "queue_depth": self._pending - self.n_running,
+                "admitted":    self.n_admitted,
+                "rejected":    self.n_rejected,
+                "wait_ms_avg": round(self.wait_ms_sum / n, 3) if n else 0.0,
+                "wait_ms_max": round(self.wait_ms_max, 3),
+            }
+
+    # ── internal ────────────────────────────
+    def _submit(self, fn, args):
+        return self._pool.submit(self._call, time.perf_counter(), fn, args)
+
+    def _call(self, t_enq: float, fn, args):
+        wait_ms = (time.perf_counter() - t_enq) * 1000.0
+        with self._lock:
+            self.n_running  += 1
+            self.n_started  += 1
+            self.wait_ms_sum += wait_ms
+            self.wait_ms_max  = max(self.wait_ms_max, wait_ms)
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.n_running -= 1
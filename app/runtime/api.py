@@ -1,17 +1,170 @@
 # runtime/api.py
-from fastapi import FastAPI, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-import uvicorn, json
+import uvicorn, asyncio, json, logging, os, threading, time
+from contextlib import contextmanager
 
-from runtime.cluster_searcher import search_clusters, cluster2pids, meta
-from runtime.graph_builder    import build_tree
+from runtime import artifacts
+from runtime.encoder          import encoder_info
+from runtime.cluster_searcher import (search_clusters, search_clusters_batch,
+                                      meta, query_cache)
+from runtime.graph_builder    import (cluster_tree, cluster_tree_list, cluster_trees,
+                                      iter_cluster_trees)
+from runtime.query_cache      import QueryCache
+from runtime.batcher          import MicroBatcher
+from runtime.admission        import AdmissionExecutor, Overloaded, INFER_RETRY_AFTER
+from runtime                  import metrics
+
+logging.basicConfig(level=logging.INFO,
+                    format="%(asctime)s %(levelname)-8s %(name)s: %(message)s")
+log = logging.getLogger("runtime")
 
 app = FastAPI(title="SearchForest-AI Recommend API")
 
+# 동시 단건 요청 → 마이크로 배치 (BATCH_MAX_SIZE / BATCH_MAX_WAIT_MS)
+batcher = MicroBatcher(search_clusters_batch)
+
+# 무거운 작업은 전용 executor 로 (INFER_WORKERS / INFER_MAX_QUEUE) – 넘치면 503
+admission = AdmissionExecutor()
+
+
+def _overloaded() -> HTTPException:
+    return HTTPException(status_code=503, detail="overloaded",
+                         headers={"Retry-After": str(INFER_RETRY_AFTER)})
+
+
+async def _admit(fn, *args):
+    try:
+        return await admission.run(fn, *args)
+    except Overloaded:
+        raise _overloaded()
+
+
+@contextmanager
+def _admitted():
+    """요청 단위 입장 – 안의 무거운 단계는 slot.call 로"""
+    try:
+        slot = admission.acquire()
+    except Overloaded:
+        raise _overloaded()
+    try:
+        yield slot
+    finally:
+        slot.release()
+
+
+async def _search(slot, query: str, top_k: int):
+    """batcher 결과는 이벤트 루프에서 기다림 → 배치 크기가 INFER_WORKERS 에 묶이지 않음"""
+    if batcher.max_size == 1:                    # 배칭 끔 → 검색 자체를 워커에서
+        return await slot.call(batcher.search, query, top_k)
+    return await asyncio.wrap_future(batcher.submit(query, top_k))
+
+
+# ── metrics: 요청 카운터 / in-flight / 지연 + 기존 stats() 카운터 (GET /metrics) ───────
+REQUESTS  = metrics.Counter("runtime_http_requests_total",
+                            "HTTP requests by route and status", ("route", "status"))
+IN_FLIGHT = metrics.Gauge("runtime_http_in_flight", "HTTP requests in progress")
+LATENCY   = metrics.Histogram("runtime_http_request_seconds",
+                              "HTTP request latency by route", ("route",))
+
+
+def _stat_metric(name, help, stats_fn, key, type="gauge"):
+    name += "_total" if type == "counter" else ""
+    metrics.CallbackMetric(name, help, lambda: stats_fn()[key], type=type)
+
+
+for _key, _type in (("requests", "counter"), ("batches", "counter"),
+                    ("queue_depth", "gauge"), ("batch_size_max", "gauge"),
+                    ("wait_ms_max", "gauge")):
+    _stat_metric(f"runtime_batcher_{_key}", f"micro-batcher {_key}",
+                 batcher.stats, _key, _type)
+for _key, _type in (("hits", "counter"), ("misses", "counter"), ("size", "gauge")):
+    _stat_metric(f"runtime_query_cache_{_key}", f"query embedding cache {_key}",
+                 query_cache.stats, _key, _type)
+for _key, _type in (("admitted", "counter"), ("rejected", "counter"),
+                    ("in_flight", "gauge"), ("queue_depth", "gauge"),
+                    ("wait_ms_max", "gauge")):
+    _stat_metric(f"runtime_admission_{_key}", f"inference admission {_key}",
+                 lambda: admission.stats(), _key, _type)
+metrics.CallbackMetric("runtime_ready", "1 once startup warm-up finished",
+                       lambda: int(_startup["ready"]))
+
+
+@app.middleware("http")
+async def _observe(request: Request, call_next):
+    # 라벨은 라우트 템플릿 (매칭 안 된 경로는 하나로 묶어 cardinality 제한)
+    # 스트리밍 응답은 헤더 전송 시점까지만 잰다
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        with IN_FLIGHT.track():
+            response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        label = route.path if route is not None else "<unmatched>"
+        REQUESTS.inc(route=label, status=str(status))
+        LATENCY.observe(time.perf_counter() - t0, route=label)
+
 
 class InferenceRequest(BaseModel):
     text: str
 
+MAX_BATCH_QUERIES = 256      # /inference/batch 1회 요청당 최대 쿼리 수
+
+class BatchInferenceRequest(BaseModel):
+    queries: list[str]
+    top_k:   int = 10
+
+
+
+# ── lifecycle: 인덱스/모델은 startup 에서 백그라운드 로드 ─────────────
+# /health 는 프로세스 생존, /ready 는 로드 완료 여부 (롤링 재시작 시 readiness probe)
+_startup = {"ready": False, "error": None, "total_s": None, "artifacts": {}}
+
+
+def _warm_up():
+    t0 = time.perf_counter()
+    try:
+        timings = artifacts.warm_up()
+    except Exception as e:
+        _startup["error"] = repr(e)
+        log.exception("startup failed")
+        return
+    total = time.perf_counter() - t0
+
+    _startup.update(ready=True, total_s=round(total, 2),
+                    artifacts={n: round(t, 2) for n, t in timings.items()})
+    breakdown = ", ".join(f"{n}={t:.2f}s" for n, t in
+                          sorted(timings.items(), key=lambda x: -x[1]))
+    log.info("startup done in %.2fs (%s)", total, breakdown)
+
+
+@app.on_event("startup")
+def start_warm_up():
+    threading.Thread(target=_warm_up, name="startup-warm-up", daemon=True).start()
+
+
+def require_ready():
+    if not _startup["ready"]:
+        raise HTTPException(status_code=503, detail="warming up",
+                            headers={"Retry-After": "5"})
+
+
+@app.get("/health")
+def health():
+    if _startup["error"]:
+        return JSONResponse({"status": "error", "error": _startup["error"]},
+                            status_code=500)
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready():
+    body = {**_startup, "encoders": encoder_info()}       # 모델별 메모리/로드 시간
+    return JSONResponse(body, status_code=200 if _startup["ready"] else 503)
 
 
 # ── Pydantic 스키마 ──────────────────────────────────────────
@@ -27,24 +180,216 @@ class ClusterNode(BaseModel):
 class RecResponse(BaseModel):
     results: dict        # root 트리 전체
 
+class BatchRecResponse(BaseModel):
+    results: list[dict]  # 쿼리 순서대로 root 트리
+
+class PidPage(BaseModel):
+    cid:         int
+    kw:          str
+    pid_count:   int
+    pids:        list[str]
+    next_cursor: str | None
+
+
+# ── hop-1 논문 목록: 유사도 상위 N 개만 인라인, 나머지는 /inference/pids 로 ─────
+HOP1_INLINE   = int(os.getenv("HOP1_INLINE", "20"))
+PID_PAGE_MAX  = 500
+
+# 사전 계산 트리 저장소 (07_precompute_trees.py) 가 없을 때 페이지마다 build_tree 를
+# 다시 돌지 않도록 cid → {level-1 키워드: 전체 hop-1 pids} 를 보관 (/inference 응답 시 채움)
+hop1_cache = QueryCache(int(os.getenv("HOP1_CACHE_SIZE", "256")),
+                        float(os.getenv("HOP1_CACHE_TTL", "600")))   # 초, 0=무제한
+
+
+def _cursor(offset: int, total: int):
+    return str(offset) if offset < total else None
+
+
+def _hop1_lists(cluster_node: dict) -> dict:
+    return {n["id"]: n.get("pids", []) for n in cluster_node["children"]}
+
+
+def _cache_hop1(cid: int, cluster_node: dict):
+    if cluster_trees().get(1) is None:           # 저장소가 있으면 조회가 싸다
+        hop1_cache.put(str(cid), _hop1_lists(cluster_node))
+
+
+def _trim_pids(cid: int, cluster_node: dict) -> dict:
+    """level-1 노드의 pids → 앞 HOP1_INLINE 개 + pid_count + next_cursor"""
+    _cache_hop1(cid, cluster_node)
+    cluster_node["cid"] = cid                     # 나머지는 /inference/pids?cid=…&kw=…
+    for node in cluster_node["children"]:
+        pids = node.get("pids", [])
+        node["pid_count"]   = len(pids)
+        node["pids"]        = pids[:HOP1_INLINE]
+        node["next_cursor"] = _cursor(HOP1_INLINE, len(pids))
+    return cluster_node
+
 
 # ── recommend ───────────────────────────────────────────────
-@app.get("/inference", response_model=RecResponse)
-def recommend(
+def _build_root(query: str, hits) -> dict:
+    """[(cid, sim), …] → root 트리"""
+    root = {"root": query, "children": []}
+
+    # root_kw = keywords[0] → 트리는 쿼리와 무관, 사전 계산본 조회 (없으면 병렬 build_tree)
+    trees = cluster_tree_list([cid for cid, _ in hits], depth=1)
+
+    for (cid, sim), cluster_node in zip(hits, trees):
+        if cluster_node is None:          # 빈 클러스터 (0 centroid)
+            continue
+        cluster_node["sim"] = round(sim, 4)
+        root["children"].append(_trim_pids(cid, cluster_node))
+    return root
+
+
+@app.get("/inference", response_model=RecResponse,
+         dependencies=[Depends(require_ready)])
+async def recommend(
     query: str = Query(..., description="검색 쿼리"),
     top_k: int = Query(10, gt=1, le=10)          # default 10
 ):
-    # 1) 쿼리 기준 top-k 클러스터
-    hits = search_clusters(query, top_k)
+    with _admitted() as slot:
+        # 1) 쿼리 기준 top-k 클러스터 (마이크로 배치) → 2) 트리 조립은 추론 워커
+        hits = await _search(slot, query, top_k)
+        return {"results": await slot.call(_build_root, query, hits)}
 
-    root = {"root": query, "children": []}
 
-    for cid, sim in hits:
-        kw_root = meta[str(cid)]["keywords"][0]
-        cluster_node = build_tree(kw_root, cid, depth=1) 
-        cluster_node["sim"] = round(sim, 4)
-        root["children"].append(cluster_node)
-    return {"results": root }
+# ── streaming: 클러스터 노드를 완성되는 대로 전송 (NDJSON / SSE) ────────────
+# 이벤트: {"type": "root", "root": query, "count": n}
+#         {"type": "cluster", "rank": i, "node": {...}}    rank = /inference 응답에서의 순서
+#         {"type": "done"}
+STREAM_MEDIA = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def _stream_events(query: str, hits):
+    yield {"type": "root", "root": query, "count": len(hits)}
+    for i, node in iter_cluster_trees([cid for cid, _ in hits], depth=1):
+        if node is None:                  # 빈 클러스터 (0 centroid)
+            continue
+        cid, sim = hits[i]
+        node["sim"] = round(sim, 4)
+        yield {"type": "cluster", "rank": i, "node": _trim_pids(cid, node)}
+    yield {"type": "done"}
+
+
+def _encode_event(ev: dict, fmt: str) -> str:
+    data = json.dumps(ev, ensure_ascii=False)
+    return f"event: {ev['type']}\ndata: {data}\n\n" if fmt == "sse" else data + "\n"
+
+
+async def _stream_body(slot, query: str, hits, fmt: str):
+    """트리 조립 (_stream_events 한 단계씩) 은 추론 워커에서 – 입장권은 제너레이터가
+    끝날 때 (소진 / 클라이언트 끊김 / GC) 반환, 끊길 때 워커에서 돌던 next() 가 있으면
+    그 작업이 끝난 뒤"""
+    events = _stream_events(query, hits)
+    try:
+        while True:
+            ev = await slot.call(next, events, None)
+            if ev is None:
+                return
+            yield _encode_event(ev, fmt)
+    finally:
+        slot.release()
+
+
+async def _prepend(first: str, rest):
+    yield first
+    async for chunk in rest:
+        yield chunk
+
+
+@app.get("/inference/stream", dependencies=[Depends(require_ready)])
+async def recommend_stream(
+    query: str = Query(..., description="검색 쿼리"),
+    top_k: int = Query(10, gt=1, le=10),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$"),
+):
+    """/inference 와 같은 트리를 클러스터 단위로 흘려보냄 (첫 가지부터 먼저 렌더링)"""
+    try:
+        slot = admission.acquire()               # 넘치면 스트림 시작 전에 503
+    except Overloaded:
+        raise _overloaded()
+    try:
+        hits = await _search(slot, query, top_k)  # 검색 실패는 스트림 시작 전에 에러 응답
+        body = _stream_body(slot, query, hits, format)
+    except BaseException:
+        slot.release()
+        raise
+    # root 이벤트까지 미리 진행 → 이후로는 제너레이터 종료가 입장권 반환을 책임짐
+    # (시작 전 제너레이터는 끊겨도 finally 가 돌지 않는다)
+    first = await body.__anext__()
+    return StreamingResponse(_prepend(first, body), media_type=STREAM_MEDIA[format],
+                             headers={"Cache-Control": "no-cache",
+                                      "X-Accel-Buffering": "no"})   # nginx 버퍼링 끔
+
+
+@app.get("/inference/pids", response_model=PidPage,
+         dependencies=[Depends(require_ready)])
+async def recommend_pids(
+    cid:    int = Query(..., ge=0, description="클러스터 id"),
+    kw:     str = Query(..., description="level-1 키워드 (node id)"),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    limit:  int = Query(100, ge=1, le=PID_PAGE_MAX),
+):
+    """
+    level-1 노드의 hop-1 논문을 유사도 순으로 페이지 단위 조회.
+    트리 저장소가 있으면 조회만, 없으면 hop1_cache (/inference 응답 때 채움) 에서 자르고
+    캐시에 없을 때만 build_tree 1회 → 캐시 (페이지마다 다시 빌드하지 않음)
+    """
+    try:
+        offset = int(cursor) if cursor else 0
+        if offset < 0:
+            raise ValueError
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+    if str(cid) not in meta():
+        raise HTTPException(status_code=404, detail="unknown cluster")
+    hop1 = hop1_cache.get(str(cid))
+    if hop1 is None:
+        tree = await _admit(cluster_tree, cid, 1)
+        hop1 = {}
+        if tree is not None:
+            _cache_hop1(cid, tree)
+            hop1 = _hop1_lists(tree)
+    pids = hop1.get(kw)
+    if pids is None:
+        raise HTTPException(status_code=404, detail="unknown keyword for cluster")
+
+    return {"cid": cid, "kw": kw, "pid_count": len(pids),
+            "pids": pids[offset:offset + limit],
+            "next_cursor": _cursor(offset + limit, len(pids))}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus text format – 단계별 지연 (runtime_stage_seconds) 포함"""
+    return PlainTextResponse(metrics.render(),
+                             media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/inference/stats")
+def inference_stats():
+    """마이크로 배처 카운터 (배치 크기 / 큐 대기시간) + 쿼리 / hop-1 캐시 hit/miss + 입장 제어"""
+    return {"batcher": batcher.stats(), "query_cache": query_cache.stats(),
+            "hop1_cache": hop1_cache.stats(), "admission": admission.stats()}
+
+
+@app.post("/inference/batch", response_model=BatchRecResponse,
+          dependencies=[Depends(require_ready)])
+async def recommend_batch(req: BatchInferenceRequest):
+    """여러 쿼리를 encode 1회 + FAISS search 1회로 처리 (prewarm / 평가용)"""
+    if not 1 < req.top_k <= 10:
+        raise HTTPException(status_code=422, detail="top_k must be in (1, 10]")
+    if len(req.queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(status_code=413,
+                            detail=f"at most {MAX_BATCH_QUERIES} queries per batch")
+    return {"results": await _admit(_recommend_batch, req.queries, req.top_k)}
+
+
+def _recommend_batch(queries: list[str], top_k: int) -> list[dict]:
+    hits_list = search_clusters_batch(queries, top_k)
+    return [_build_root(q, hits) for q, hits in zip(queries, hits_list)]
 
     
 
@@ -0,0 +1,67 @@
+# runtime/artifacts.py
+"""
+런타임 산출물(indices/*, 모델) 지연 로딩 레지스트리
+
+  @artifact("name")        – 로더 등록. 반환된 함수를 처음 호출할 때 1회 로드 후 캐시
+  @artifact("name", warm=False)
+                           – startup warm-up 에서 제외 (실제로 쓰일 때만 로드)
+  warm_up()                – startup 에서 warm 대상 전체를 병렬 로드, 항목별 소요시간 반환
+
+import 만으로는 아무것도 로드하지 않는다.
+"""
+import functools, logging, os, pathlib, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+IDX_DIR      = pathlib.Path(os.getenv("INDEX_DIR", "indices"))
+LOAD_WORKERS = int(os.getenv("ARTIFACT_LOAD_WORKERS", "4"))
+
+log = logging.getLogger("runtime")
+
+_loaders: dict = {}          # name → (loader, warm)
+_values:  dict = {}          # name → 로드된 객체
+_timings: dict = {}          # name → 로드 소요시간(초)
+_locks:   dict = {}          # name → 로드 중복 방지 lock
+
+
+def artifact(name: str, warm: bool = True):
+    def deco(loader):
+        _loaders[name] = (loader, warm)
+        _locks[name]   = threading.Lock()
+
+        @functools.wraps(loader)
+        def get():
+            try:
+                return _values[name]
+            except KeyError:
+                return _load(name)
+        return get
+    return deco
+
+
+def _load(name: str):
+    with _locks[name]:
+        if name in _values:                   # 다른 스레드가 먼저 로드
+            return _values[name]
+        t0 = time.perf_counter()
+        value = _loaders[name][0]()
+        _timings[name] = time.perf_counter() - t0
+        _values[name]  = value
+        log.info("loaded %-18s %8.2fs", name, _timings[name])
+        return value
+
+
+def warm_up(names=None) -> dict[str, float]:
+    """warm 대상(또는 names) 병렬 로드 → {name: 초}"""
+    names = list(names or (n for n, (_, warm) in _loaders.items() if warm))
+    with ThreadPoolExecutor(max_workers=max(1, LOAD_WORKERS),
+                            thread_name_prefix="artifact-load") as ex:
+        list(ex.map(_load, names))
+    return {n: _timings[n] for n in names}
+
+
+def timings() -> dict[str, float]:
+    return dict(_timings)
+
+
+def is_loaded(name: str) -> bool:
+    return name in _values
@@ -0,0 +1,126 @@
+# runtime/batcher.py
+"""
+동시에 들어온 단건 /inference 요청을 작은 배치로 묶어
+search_clusters_batch 1회(encode 1회 + FAISS search 1회)로 처리한다.
+
+  • BATCH_MAX_SIZE     – 배치당 최대 쿼리 수 (1 이면 배칭 끔)
+  • BATCH_MAX_WAIT_MS  – 첫 요청 이후 배치를 채우기 위해 기다리는 최대 시간
+
+두 값이 처리량 ↔ 지연시간 트레이드오프 조절 손잡이다.
+"""
+import os, queue, threading, time
+from concurrent.futures import Future
+
+BATCH_MAX_SIZE    = int(os.getenv("BATCH_MAX_SIZE", "16"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+
+
+class _Item:
+    __slots__ = ("query", "topk", "future", "t_enq")
+
+    def __init__(self, query: str, topk: int):
+        self.query  = query
+        self.topk   = topk
+        self.future = Future()
+        self.t_enq  = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    batch_fn(queries, topk) → [[(cid, sim), …], …] 를 감싸는 동적 마이크로 배처.
+    search() 는 호출 스레드를 결과가 나올 때까지 블록한다 (sync 핸들러용).
+    """
+
+    def __init__(self, batch_fn,
+                 max_size: int = BATCH_MAX_SIZE,
+                 max_wait_ms: float = BATCH_MAX_WAIT_MS):
+        self.batch_fn    = batch_fn
+        self.max_size    = max(1, int(max_size))
+        self.max_wait    = max(0.0, max_wait_ms) / 1000.0
+        self._q          = queue.Queue()
+        self._worker     = None
+        self._lock       = threading.Lock()
+
+        # ── 카운터 ──────────────────────────
+        self.n_requests     = 0
+        self.n_batches      = 0
+        self.batch_size_max = 0
+        self.wait_ms_sum    = 0.0
+        self.wait_ms_max    = 0.0
+
+    # ── public ──────────────────────────────
+    def search(self, query: str, topk: int = 5):
+        if self.max_size == 1:                  # 배칭 끔 → 바로 실행
+            self._record([0.0])
+            return self.batch_fn([query], topk)[0]
+        return self.submit(query, topk).result()
+
+    def submit(self, query: str, topk: int = 5) -> Future:
+        self._ensure_worker()
+        item = _Item(query, topk)
+        self._q.put(item)
+        return item.future
+
+    def stats(self) -> dict:
+        with self._lock:
+            n_req, n_bat = self.n_requests, self.n_batches
+            return {
+                "max_size":       self.max_size,
+                "max_wait_ms":    self.max_wait * 1000.0,
+                "requests":       n_req,
+                "batches":        n_bat,
+                "queue_depth":    self._q.qsize(),
+                "batch_size_avg": round(n_req / n_bat, 3) if n_bat else 0.0,
+                "batch_size_max": self.batch_size_max,
+                "wait_ms_avg":    round(self.wait_ms_sum / n_req, 3) if n_req else 0.0,
+                "wait_ms_max":    round(self.wait_ms_max, 3),
+            }
+
+    # ── internal ────────────────────────────
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._loop,
+                                                name="micro-batcher",
+                                                daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> list[_Item]:
+        batch    = [self._q.get()]               # 첫 요청까지는 무한 대기
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_size:
+            remain = deadline - time.perf_counter()
+            if remain <= 0:
+                break
+            try:
+                batch.append(self._q.get(timeout=remain))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            t0    = time.perf_counter()
+            self._record([(t0 - it.t_enq) * 1000.0 for it in batch])
+
+            topk = max(it.topk for it in batch)
+            try:
+                hits = self.batch_fn([it.query for it in batch], topk)
+            except Exception as e:               # 배치 전체 실패 → 모두에게 전달
+                for it in batch:
+                    it.future.set_exception(e)
+                continue
+
+            for it, h in zip(batch, hits):       # 결과 scatter
+                it.future.set_result(h[:it.topk])
+
+    def _record(self, waits_ms: list[float]):
+        with self._lock:
+            self.n_requests    += len(waits_ms)
+            self.n_batches     += 1
+            self.batch_size_max = max(self.batch_size_max, len(waits_ms))
+            self.wait_ms_sum   += sum(waits_ms)
+            self.wait_ms_max    = max(self.wait_ms_max, max(waits_ms))
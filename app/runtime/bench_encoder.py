@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# runtime/bench_encoder.py
+"""
+인코더 백엔드별 지연시간 + fp32 대비 cosine 벤치마크
+  python -m runtime.bench_encoder --backends torch int8 --device cpu
+"""
+import argparse, time
+import numpy as np
+
+from runtime.encoder import BACKENDS, load_encoder
+
+QUERIES = [
+    "graph neural network", "finite element method", "protein folding",
+    "reinforcement learning for robotics", "quantum error correction",
+    "weak galerkin", "citation recommendation", "large language model",
+    "image segmentation", "stochastic differential equations",
+    "그래프 신경망", "자연어 처리",
+]
+
+p = argparse.ArgumentParser()
+p.add_argument("--model", default="moka-ai/m3e-base")
+p.add_argument("--backends", nargs="+", default=["torch", "int8"], choices=BACKENDS)
+p.add_argument("--device", default="cpu")
+p.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 16, 64])
+p.add_argument("--repeat", type=int, default=20)
+args = p.parse_args()
+
+
+def texts(n):
+    return [QUERIES[i % len(QUERIES)] + f" {i // len(QUERIES)}" for i in range(n)]
+
+
+ref = load_encoder(args.model, "torch", args.device)
+ref_emb = ref.encode(QUERIES, normalize_embeddings=True)
+
+print(f"{'backend':<8}{'batch':>7}{'p50 ms':>10}{'p99 ms':>10}{'min cos':>10}")
+for backend in args.backends:
+    model = ref if backend == "torch" else load_encoder(args.model, backend, args.device)
+    emb   = model.encode(QUERIES, normalize_embeddings=True)
+    min_cos = float(np.min(np.sum(emb * ref_emb, axis=1)))
+
+    for bs in args.batch_sizes:
+        batch = texts(bs)
+        model.encode(batch, normalize_embeddings=True)         # warm-up
+        lat = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            model.encode(batch, batch_size=bs, normalize_embeddings=True)
+            lat.append((time.perf_counter() - t0) * 1000.0)
+        print(f"{backend:<8}{bs:>7}{np.percentile(lat, 50):>10.2f}"
+              f"{np.percentile(lat, 99):>10.2f}{min_cos:>10.4f}")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# runtime/bench_mmr.py
+"""
+MMR 키워드 선택 마이크로벤치마크: 기존 루프(util.cos_sim + .item()) vs 행렬 MMR
+  python -m runtime.bench_mmr --sizes 20 200 2000 -k 3
+"""
+import argparse, time
+import numpy as np
+from sentence_transformers import util
+
+from runtime.mmr import mmr_select, normalize_rows, row_dots
+
+α, β, γ, LAM = 0.4, 0.4, 0.2, 0.6
+
+p = argparse.ArgumentParser()
+p.add_argument("--sizes", nargs="+", type=int, default=[20, 200, 2000])
+p.add_argument("-k", type=int, default=3)
+p.add_argument("--dim", type=int, default=768)
+p.add_argument("--repeat", type=int, default=5)
+args = p.parse_args()
+
+
+def legacy(q_emb, kws, embs, tfidf, k):
+    scored = []
+    for kw, e in zip(kws, embs):
+        sc = (α * util.cos_sim(q_emb, e).item() +
+              β * util.cos_sim(q_emb, e).item() +
+              γ * tfidf.get(kw, 0.0))
+        scored.append([sc, kw, e])
+    selected, selected_embs = [], []
+    while scored and len(selected) < k:
+        scored.sort(reverse=True, key=lambda x: (x[0], x[1]))
+        best_sc, best_kw, best_emb = scored.pop(0)
+        selected.append((best_kw, best_sc))
+        selected_embs.append(best_emb)
+        scored = [[sc - LAM * max(util.cos_sim(e, se).item() for se in selected_embs), kw, e]
+                  for sc, kw, e in scored]
+    return selected
+
+
+def vectorized(q_emb, kws, embs, tfidf, k):
+    C     = normalize_rows(embs)
+    q_sim = row_dots(normalize_rows(q_emb), C).astype("float64")
+    base  = α * q_sim + β * q_sim + γ * np.array([tfidf.get(kw, 0.0) for kw in kws])
+    return [(kws[i], sc) for i, sc in mmr_select(base, k, LAM, embs=C, keys=kws)]
+
+
+def timeit(fn, *a):
+    lat = []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        out = fn(*a)
+        lat.append((time.perf_counter() - t0) * 1000.0)
+    return float(np.median(lat)), out
+
+
+rng = np.random.default_rng(0)
+print(f"{'n':>6}{'legacy ms':>12}{'matrix ms':>12}{'speedup':>10}  same")
+for n in args.sizes:
+    embs  = normalize_rows(rng.standard_normal((n, args.dim)))
+    q     = embs[0]
+    kws   = [f"kw{i}" for i in range(n)]
+    tfidf = {kw: float(rng.random()) for kw in kws}
+
+    t_old, a = timeit(legacy, q, kws, embs, tfidf, args.k)
+    t_new, b = timeit(vectorized, q, kws, embs, tfidf, args.k)
+    same = [x for x, _ in a] == [x for x, _ in b]
+    print(f"{n:>6}{t_old:>12.2f}{t_new:>12.3f}{t_old / t_new:>9.0f}x  {same}")
@@ -0,0 +1,58 @@
+# runtime/blob_store.py
+"""
+가변 길이 레코드 저장소: UTF-8 blob 1개 + offsets 배열
+
+  <prefix>.blob          – 레코드를 이어 붙인 바이트열
+  <prefix>.offsets.npy   – int64 [n+1]  레코드 i = blob[off[i]:off[i+1]]
+
+읽기는 둘 다 mmap (read-only) → uvicorn 워커들이 page cache 를 공유하고,
+파이썬 객체가 없으니 refcount 로 인한 copy-on-write 복제도 없다.
+"""
+import pathlib
+import numpy as np
+
+
+def _paths(prefix):
+    prefix = pathlib.Path(prefix)
+    return (prefix.with_name(prefix.name + ".blob"),
+            prefix.with_name(prefix.name + ".offsets.npy"))
+
+
+def write_blob_store(prefix, records) -> int:
+    """records(str | bytes 반복자) → 파일 2개, 레코드 수 반환"""
+    blob_path, off_path = _paths(prefix)
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+
+    offsets = [0]
+    with blob_path.open("wb") as f:
+        for r in records:
+            b = r.encode("utf-8") if isinstance(r, str) else bytes(r)
+            f.write(b)
+            offsets.append(offsets[-1] + len(b))
+    np.save(off_path, np.asarray(offsets, dtype="int64"))
+    return len(offsets) - 1
+
+
+def blob_store_exists(prefix) -> bool:
+    return all(p.exists() for p in _paths(prefix))
+
+
+class BlobStore:
+    def __init__(self, prefix):
+        blob_path, off_path = _paths(prefix)
+        self.offsets = np.load(off_path, mmap_mode="r")
+        self.blob = (np.memmap(blob_path, dtype="uint8", mode="r")
+                     if blob_path.stat().st_size else np.zeros(0, dtype="uint8"))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def get_bytes(self, i: int) -> bytes:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def __getitem__(self, i: int) -> str:
+        return self.get_bytes(i).decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
@@ -1,39 +1,175 @@
 # runtime/cluster_searcher.py
-import faiss, numpy as np, json, pickle, pathlib
+import faiss, numpy as np, json, pickle, os
 from sentence_transformers import SentenceTransformer
+from runtime.artifacts import IDX_DIR, artifact
+from runtime.encoder import MODEL_NAME, get_encoder
+from runtime.id_table import IdTable, id_table_exists
+from runtime.query_cache import QueryCache, normalize_query
+from runtime.metrics import stage
 
-IDX_DIR = pathlib.Path("indices")
-MODEL_NAME = "moka-ai/m3e-base"
+# ── 데이터 로드 (지연 로딩, startup 에서 warm_up) ──────────
+# 쿼리의 그래프 부분은 항상 0벡터 → 텍스트 slice(384-d) 인덱스로 동일 순위/점수.
+# 구버전 indices/ (cluster_text.index 없음) 는 512-d 인덱스 + 0 padding 으로 폴백.
+TEXT_INDEX = IDX_DIR / "cluster_text.index"
+PAD_GRAPH  = not TEXT_INDEX.exists()
 
-# ── 데이터 로드 ──────────────────────────
-index  = faiss.read_index(str(IDX_DIR / "cluster.index"))
-cent   = np.load(IDX_DIR / "cluster_centroids.npy").astype("float32")
-meta   = json.load(open(IDX_DIR / "cluster_meta.json"))
-pid2i  = pickle.load(open(IDX_DIR / "pid2idx.pkl", "rb"))
-labels = np.load(IDX_DIR / "cluster_labels.npy")
+# 인덱스 파일을 mmap → 여러 워커가 page cache 공유, 로드 시 복사 없음
+IO_FLAGS = getattr(faiss, "IO_FLAG_MMAP", 0) | getattr(faiss, "IO_FLAG_READ_ONLY", 0)
 
-# cluster_id → [paper_id, …]
-cluster2pids = {}
-for pid, idx in pid2i.items():
-    cid = int(labels[idx])          # 반드시 int
-    cluster2pids.setdefault(cid, []).append(pid)
 
-# ── SBERT 모델 (GPU 사용) ────────────────
-model = SentenceTransformer(MODEL_NAME, device="cuda:0")
+@artifact("cluster_index")
+def cluster_index():
+    index = faiss.read_index(str(IDX_DIR / "cluster.index" if PAD_GRAPH
+                                 else TEXT_INDEX), IO_FLAGS)
+
+    # IVF nprobe / HNSW efSearch 는 빌드 시 값이 인덱스에 저장됨 → env 로 덮어쓰기
+    for param, env in (("nprobe", "FAISS_NPROBE"), ("efSearch", "FAISS_EF_SEARCH")):
+        if os.getenv(env):
+            try:
+                faiss.ParameterSpace().set_index_parameter(index, param,
+                                                           int(os.environ[env]))
+            except RuntimeError:              # flat 등 해당 파라미터 없는 인덱스
+                pass
+    return index
+
+
+@artifact("cluster_meta")
+def meta() -> dict:
+    with open(IDX_DIR / "cluster_meta.json") as f:
+        return json.load(f)
+
+
+@artifact("cluster_labels")
+def labels() -> np.ndarray:
+    return np.load(IDX_DIR / "cluster_labels.npy", mmap_mode="r")
+
+
+class _PickledIds:
+    """구버전 indices/pid2idx.pkl 호환용 (IdTable 과 같은 인터페이스)"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._row = pickle.load(f)
+        self._pid = [None] * len(self._row)
+        for pid, idx in self._row.items():
+            self._pid[idx] = pid
+
+    def __len__(self):
+        return len(self._pid)
+
+    def pid(self, row):
+        return self._pid[int(row)]
+
+    def pids(self, rows):
+        return [self._pid[int(r)] for r in rows]
+
+    def row(self, pid, default=None):
+        return self._row.get(pid, default)
+
+
+@artifact("paper_ids")
+def paper_ids() -> IdTable:
+    """paper_id ↔ row (04_concat_embed.py 산출, mmap)"""
+    if id_table_exists(IDX_DIR / "paper_ids"):
+        return IdTable(IDX_DIR / "paper_ids")
+    return _PickledIds(IDX_DIR / "pid2idx.pkl")
+
+
+# ── 클러스터 멤버십 CSR (06_build_index*.py 산출, mmap) ─────────
+@artifact("cluster_csr")
+def cluster_csr():
+    """(offsets[C+1], members[N]) – 멤버 = members[off[c]:off[c+1]]"""
+    off_path, mem_path = IDX_DIR / "cluster_offsets.npy", IDX_DIR / "cluster_members.npy"
+    if off_path.exists() and mem_path.exists():
+        return (np.load(off_path, mmap_mode="r"),
+                np.load(mem_path, mmap_mode="r"))
+
+    # 구버전 indices/ → labels 로부터 즉석 생성 (argsort 1회)
+    lab     = np.asarray(labels()).astype("int64")
+    members = np.argsort(lab, kind="stable").astype("int32")
+    offsets = np.zeros(int(lab.max()) + 2, dtype="int64")
+    np.cumsum(np.bincount(lab), out=offsets[1:])
+    return offsets, members
+
+
+def cluster_span(cid: int) -> tuple[int, int]:
+    """cluster_id → [lo, hi) : members 및 *_clustered.npy slab 구간"""
+    offsets, _ = cluster_csr()
+    if not 0 <= cid < len(offsets) - 1:
+        return 0, 0
+    return int(offsets[cid]), int(offsets[cid + 1])
+
+
+def cluster_rows(cid: int) -> np.ndarray:
+    """cluster_id → paper row 배열 (mmap zero-copy 슬라이스)"""
+    lo, hi = cluster_span(cid)
+    return cluster_csr()[1][lo:hi]
+
+
+def cluster_pids(cid: int) -> list[str]:
+    """cluster_id → [paper_id, …]"""
+    return paper_ids().pids(cluster_rows(cid))
+
+
+# ── SBERT 모델 (프로세스 공유 인코더) ────────────────
+def model() -> SentenceTransformer:
+    return get_encoder(MODEL_NAME)
+
+
+# ── 쿼리 벡터 캐시 (정규화 텍스트 → 쿼리 벡터) ──
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "4096"))
+QUERY_CACHE_TTL  = float(os.getenv("QUERY_CACHE_TTL", "3600"))   # 초, 0=무제한
+query_cache = QueryCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL)
 
 ALPHA = 1.0          # Step 04에서 사용한 비율과 동일
-def search_clusters(query: str, topk: int = 5):
-    """query → [(cid, sim), …]"""
-    txt = model.encode([query], normalize_embeddings=True)[0]  # (384,)
-    txt = txt.astype("float32") * ALPHA                       # 가중치
+def _encode_queries(texts: list[str]) -> np.ndarray:
+    """texts → (n, 384) 정규화 텍스트 벡터 (구버전 인덱스면 (n, 512))"""
+    txt = model().encode(list(texts), normalize_embeddings=True)    # (n, 384)
+    txt = txt.astype("float32")
+    if not PAD_GRAPH:
+        # [ALPHA·t, 0] / ‖ALPHA·t‖ · c  ==  t · c[:384]  → concat/재정규화 불필요
+        return txt
 
-    g_zero = np.zeros(128, dtype="float32")                   # 그래프 0벡터
-    q_vec  = np.concatenate([txt, g_zero])                    # (512,)
+    txt *= ALPHA                                                 # 가중치
+    g_zero = np.zeros((len(txt), 128), dtype="float32")          # 그래프 0벡터
+    q_mat  = np.hstack([txt, g_zero])                            # (n, 512)
 
     # (선택) 최종 L2 정규화
-    q_vec /= np.linalg.norm(q_vec) + 1e-9
-    q_vec = q_vec.reshape(1, -1).astype("float32")
+    q_mat /= np.linalg.norm(q_mat, axis=1, keepdims=True) + 1e-9
+    return q_mat
+
+
+def _query_matrix(queries: list[str]) -> np.ndarray:
+    """queries → 쿼리 행렬; 캐시 miss 난 쿼리만 모아서 encode 1회"""
+    keys = [normalize_query(q) for q in queries]
+    vecs = [query_cache.get(k) for k in keys]
+
+    miss = list(dict.fromkeys(k for k, v in zip(keys, vecs) if v is None))
+    if miss:
+        with stage("query_encode"):
+            enc = dict(zip(miss, _encode_queries(miss)))
+        for k, v in enc.items():
+            v.setflags(write=False)           # 캐시 공유 벡터 → 읽기 전용
+            query_cache.put(k, v)
+        vecs = [enc[k] if v is None else v for k, v in zip(keys, vecs)]
+
+    return np.ascontiguousarray(np.vstack(vecs), dtype="float32")
 
-    D, I = index.search(q_vec, topk)
-    return [(int(cid), float(sim)) for cid, sim in zip(I[0], D[0])]
 
+def search_clusters_batch(queries: list[str], topk: int = 5):
+    """[query, …] → [[(cid, sim), …], …]  (encode 1회 + index.search 1회)"""
+    if not queries:
+        return []
+    q_mat = _query_matrix(queries)
+    with stage("faiss_search"):
+        D, I = cluster_index().search(q_mat, topk)
+    return [
+        [(int(cid), float(sim)) for cid, sim in zip(I_row, D_row)
+         if cid >= 0]                         # ANN 인덱스는 부족분을 -1 로 채움
+        for I_row, D_row in zip(I, D)
+    ]
+
+
+def search_clusters(query: str, topk: int = 5):
+    """query → [(cid, sim), …]"""
+    return search_clusters_batch([query], topk)[0]
@@ -0,0 +1,108 @@
+# runtime/encoder.py
+"""
+문장 인코더 레지스트리 – 모델 이름당 프로세스에서 1회만 로드해 모든 런타임 모듈이 공유
+
+  ENCODER_BACKEND  torch  – SentenceTransformer fp32 (기본)
+                   fp16   – 반정밀도 (GPU 용)
+                   int8   – CPU 동적 양자화 (nn.Linear → qint8), GPU 없는 노드용
+                   onnx   – ONNX Runtime (sentence-transformers ≥ 3.2 + optimum[onnxruntime])
+  ENCODER_DEVICE   cuda:0 / cpu   (기본: GPU 있으면 cuda:0, 없으면 cpu)
+  ENCODER_THREADS  CPU 추론 스레드 수 (기본: torch 기본값)
+"""
+import logging, os, threading, time
+import torch
+from sentence_transformers import SentenceTransformer
+
+from runtime.artifacts import artifact
+
+MODEL_NAME = "moka-ai/m3e-base"
+BACKENDS   = ("torch", "fp16", "int8", "onnx")
+
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")
+ENCODER_DEVICE  = os.getenv("ENCODER_DEVICE",
+                            "cuda:0" if torch.cuda.is_available() else "cpu")
+ENCODER_THREADS = int(os.getenv("ENCODER_THREADS", "0"))
+
+log = logging.getLogger("runtime")
+
+
+def load_encoder(name: str,
+                 backend: str = ENCODER_BACKEND,
+                 device: str = ENCODER_DEVICE) -> SentenceTransformer:
+    """backend 에 맞게 새로 로드한 SentenceTransformer (encode() 인터페이스 동일)"""
+    if ENCODER_THREADS:
+        torch.set_num_threads(ENCODER_THREADS)
+
+    if backend == "torch":
+        return SentenceTransformer(name, device=device)
+
+    if backend == "fp16":
+        return SentenceTransformer(name, device=device).half()
+
+    if backend == "int8":
+        # 동적 양자화는 CPU 전용 → device 무시
+        model = SentenceTransformer(name, device="cpu")
+        model.eval()
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    if backend == "onnx":
+        return SentenceTransformer(name, device=device, backend="onnx")
+
+    raise ValueError(f"unknown encoder backend: {backend!r} "
+                     f"(choose from {', '.join(BACKENDS)})")
+
+
+def model_memory_mb(model) -> float:
+    """state_dict 텐서 바이트 합 (양자화 packed 파라미터 포함)"""
+    def nbytes(x):
+        if isinstance(x, torch.Tensor):
+            return x.numel() * x.element_size()
+        if isinstance(x, (tuple, list)):
+            return sum(nbytes(y) for y in x)
+        return 0
+    try:
+        return sum(nbytes(v) for v in model.state_dict().values()) / 2**20
+    except Exception:                          # onnx 등 state_dict 없는 백엔드
+        return 0.0
+
+
+# ── 프로세스 공유 레지스트리 ───────────────────────────
+_encoders: dict = {}         # name → SentenceTransformer
+_info:     dict = {}         # name → {backend, device, memory_mb, load_s, warmup_ms}
+_lock = threading.Lock()
+
+
+def get_encoder(name: str = MODEL_NAME) -> SentenceTransformer:
+    """name 의 인코더 (최초 호출 시 로드 + warm-up, 이후 동일 인스턴스)"""
+    try:
+        return _encoders[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name not in _encoders:
+            t0 = time.perf_counter()
+            model = load_encoder(name)
+            t1 = time.perf_counter()
+            model.encode(["warm up"], normalize_embeddings=True)  # CUDA 커널/스레드풀 초기화
+            t2 = time.perf_counter()
+
+            _info[name] = {
+                "backend":   ENCODER_BACKEND,
+                "device":    str(model.device),
+                "memory_mb": round(model_memory_mb(model), 1),
+                "load_s":    round(t1 - t0, 2),
+                "warmup_ms": round((t2 - t1) * 1000.0, 1),
+            }
+            _encoders[name] = model
+            log.info("encoder %s  %s", name, _info[name])
+    return _encoders[name]
+
+
+def encoder_info() -> dict:
+    return {n: dict(i) for n, i in _info.items()}
+
+
+@artifact("encoder")
+def default_encoder() -> SentenceTransformer:
+    return get_encoder(MODEL_NAME)
@@ -1,13 +1,23 @@
 #!/usr/bin/env python3
 # runtime/graph_builder.py
-import pickle, re, networkx as nx
+import copy, os, pickle, re, networkx as nx
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pathlib 
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sentence_transformers.util import cos_sim
-import numpy as np, tqdm
+import numpy as np, scipy.sparse as sp, tqdm
 from sentence_transformers import SentenceTransformer, util
 import torch
-from runtime.cluster_searcher import meta, cluster2pids   # ← meta 와 함께 추가로 import
+from runtime.artifacts import IDX_DIR, artifact
+from runtime.encoder import MODEL_NAME, get_encoder
+from runtime.mmr import mmr_select, normalize_rows, row_dots
+from runtime.tree_store import TreeStore, tree_store_exists, tree_store_prefix
+from runtime.abstract_store import AbstractStore, abstract_store_exists, as_text
+from runtime.blob_store import BlobStore, blob_store_exists
+from runtime.sparse_store import csr_exists, load_csr
+from runtime.kw_matcher import KeywordMatcher
+from runtime.metrics import stage
+from runtime.cluster_searcher import meta, cluster_csr, cluster_span, cluster_rows, paper_ids   # ← meta 와 함께 추가로 import
 
 
 
@@ -15,7 +25,9 @@ from runtime.cluster_searcher import meta, cluster2pids   # ← meta 와 함께
 # ── 전역 설정 ───────────────────────────────────────────
 α, β, γ = 0.4, 0.4, 0.2         # (query, parentKw, TF-IDF) 가중치
 MMR_LAMBDA = 0.6
-model = SentenceTransformer("moka-ai/m3e-base", device="cuda:0")
+
+def model() -> SentenceTransformer:
+    return get_encoder(MODEL_NAME)
 
 def tfidf_score(kw, tfidf_dict):
     """클러스터 TF-IDF 합 딕셔너리에서 점수 조회 (없으면 0)"""
@@ -24,62 +36,202 @@ def tfidf_score(kw, tfidf_dict):
 def select_kw_scored(query_kw: str,
                      candidate_kws: list[str],
                      tfidf_dict: dict[str, float],
-                     k: int = 5):
+                     k: int = 5,
+                     cand_embs=None,
+                     q_emb=None):
     """
     반환값: [(kw, score), …]  (score는 0~1 정도의 실수)
+    cand_embs / q_emb 를 주면 (사전 계산 임베딩) encode 를 건너뛴다.
     """
-    q_emb      = model.encode([query_kw], normalize_embeddings=True)[0]
-    cand_embs  = model.encode(candidate_kws, normalize_embeddings=True)
-
-    scored = []
-    for kw, e in zip(candidate_kws, cand_embs):
-        sc = (α * util.cos_sim(q_emb, e).item() +
-              β * util.cos_sim(q_emb, e).item() +     # parent==query
-              γ * tfidf_score(kw, tfidf_dict))
-        scored.append([sc, kw, e])
+    if not candidate_kws:
+        return []
+    if q_emb is None:
+        q_emb = model().encode([query_kw], normalize_embeddings=True)[0]
+    if cand_embs is None:
+        cand_embs = model().encode(candidate_kws, normalize_embeddings=True)
+
+    # ── 유사도 행렬 1회 계산 (cos_sim 과 동일하게 행 정규화) ──────
+    C     = normalize_rows(np.asarray(cand_embs))            # (n, d)
+    q_sim = row_dots(normalize_rows(np.asarray(q_emb)), C)   # (n,)
+    tf    = np.array([tfidf_score(kw, tfidf_dict) for kw in candidate_kws])
+    base  = (α * q_sim.astype("float64") +
+             β * q_sim.astype("float64") +                   # parent==query
+             γ * tf)
 
     # ── MMR 다양화 ────────────────────────────────
-    selected, selected_embs = [], []
-    while scored and len(selected) < k:
-        scored.sort(reverse=True)          # sc 내림차순
-        best_sc, best_kw, best_emb = scored.pop(0)
-        selected.append((best_kw, best_sc))
-        selected_embs.append(best_emb)
-
-        # diversity 보정
-        new_scored = []
-        for sc, kw, e in scored:
-            div = max(util.cos_sim(e, se).item() for se in selected_embs)
-            new_scored.append([sc - MMR_LAMBDA * div, kw, e])
-        scored = new_scored
+    picks    = mmr_select(base, k, MMR_LAMBDA, embs=C, keys=candidate_kws)
+    selected = [(candidate_kws[i], sc) for i, sc in picks]
 
     return selected            # [(kw, score), …]
 
 
+def select_kw_scored_batch(parent_embs,
+                           candidate_kws: list[str],
+                           tfidf_dict: dict[str, float],
+                           k: int = 5,
+                           cand_embs=None):
+    """
+    부모 키워드 여러 개에 대한 select_kw_scored 를 한 번에 (결과 동일).
+    부모×후보 유사도를 한 번에 만들고 부모마다 MMR 만 수행 (후보 간 유사도는 선택된 행만).
+    반환값: 부모 순서대로 [[(kw, score), …], …]
+    """
+    if not candidate_kws or not len(parent_embs):
+        return [[] for _ in range(len(parent_embs))]
+    if cand_embs is None:
+        cand_embs = model().encode(candidate_kws, normalize_embeddings=True)
+
+    C        = normalize_rows(np.asarray(cand_embs))             # (n, d)
+    q_sim    = row_dots(normalize_rows(np.asarray(parent_embs)), C).astype("float64")   # (p, n)
+    tf       = np.array([tfidf_score(kw, tfidf_dict) for kw in candidate_kws])
+    base     = α * q_sim + β * q_sim + γ * tf                    # (p, n)
+
+    return [[(candidate_kws[i], sc)
+             for i, sc in mmr_select(row, k, MMR_LAMBDA, embs=C, keys=candidate_kws)]
+            for row in base]
+
+
 
 
 
 
-# 1) citation 그래프 + abstract 로드 ------------------------------------------------
-with open("indices/graph_raw.gpickle", "rb") as f:
-    G: nx.DiGraph = pickle.load(f)           # ↔ DiGraph 그대로 복구
+# 0) 클러스터 키워드 임베딩 (06_build_index_m3e.py 산출, mmap) -----------------------
+@artifact("cluster_kw_emb")
+def cluster_kw_emb():
+    """(offsets[C+1], emb[K, D]) – 행 off[c]:off[c+1] ↔ meta[c]["keywords"]; 없으면 None"""
+    off_path, emb_path = IDX_DIR / "cluster_kw_offsets.npy", IDX_DIR / "cluster_kw_emb.npy"
+    if not (off_path.exists() and emb_path.exists()):
+        return None
+    return np.load(off_path, mmap_mode="r"), np.load(emb_path, mmap_mode="r")
+
+
+def _precomputed_kw_embs(cid: int, kws: list[str]):
+    pre = cluster_kw_emb()
+    if pre is not None:
+        off, emb = pre
+        if cid + 1 < len(off) and off[cid + 1] - off[cid] == len(kws):
+            return emb[off[cid]:off[cid + 1]]
+    return None
+
+
+def keyword_embs(cid: int, kws: list[str]) -> np.ndarray:
+    """meta[cid]["keywords"] 의 정규화 임베딩 (사전 계산 행렬 슬라이스, 없으면 encode)"""
+    emb = _precomputed_kw_embs(cid, kws)
+    if emb is not None:
+        return emb
+    with stage("keyword_encode"):
+        return model().encode(kws, normalize_embeddings=True)
+
+
+def keyword_embs_many(cids) -> dict[int, np.ndarray]:
+    """여러 클러스터의 keyword_embs – 사전 계산이 없는 클러스터들은 encode 1회로 모아서"""
+    out, missing = {}, []
+    for cid in cids:
+        kws = meta()[str(cid)]["keywords"]
+        if (emb := _precomputed_kw_embs(cid, kws)) is not None:
+            out[cid] = emb
+        elif kws:
+            missing.append((cid, kws))
+
+    if missing:
+        uniq = list(dict.fromkeys(kw for _, kws in missing for kw in kws))
+        pos  = {kw: i for i, kw in enumerate(uniq)}
+        with stage("keyword_encode"):
+            E = model().encode(uniq, normalize_embeddings=True)
+        for cid, kws in missing:
+            out[cid] = E[[pos[kw] for kw in kws]]
+    return out
+
+
+# 1) abstract 저장소 (키워드 추출에서만 사용 → 필요할 때 로드) ----------
+@artifact("citation_graph", warm=False)
+def graph() -> nx.DiGraph:
+    with open(IDX_DIR / "graph_raw.gpickle", "rb") as f:
+        return pickle.load(f)                # ↔ DiGraph 그대로 복구
+
+
+class _GraphAbstracts:
+    """구버전 indices/ (abstracts.* 없음) → 그래프 노드 속성에서 읽기"""
+    def __init__(self, G: nx.DiGraph):
+        self._G = G
+
+    def get(self, pid, default=None):
+        if not self._G.has_node(pid):
+            return default
+        return as_text(self._G.nodes[pid].get("abstract"))
+
+    def texts(self, pids) -> list:
+        return [self.get(p) for p in pids]
+
+
+@artifact("abstracts", warm=False)
+def abstracts():
+    """paper_id → abstract (01_extract_graph.py 산출, mmap)"""
+    if abstract_store_exists(IDX_DIR / "abstracts"):
+        return AbstractStore(IDX_DIR / "abstracts")
+    return _GraphAbstracts(graph())
 
 # 2) 유틸 -------------------------------------------------------------------------
 TOKEN_RE = re.compile(r"^[a-zA-Z]{2,}$")     # 영문 ≥3 글자 토큰만
 
-# (1) 키워드/문장 임베딩 모델 – m3e 를 그대로 재사용
-kw_model = SentenceTransformer("moka-ai/m3e-base", device="cuda:0")
+# (1) 키워드/문장 임베딩 모델 – m3e 를 그대로 재사용 (같은 인스턴스)
+kw_model = model
 
 # (2) 논문 abstract 임베딩: 02_embed_text.py 에서 저장한 NPZ 재사용
-TEXT_EMB_NPZ = pathlib.Path("indices/text_emb.npz")
-text_npz = np.load(TEXT_EMB_NPZ)                # key = paper_id → (384,)
+TEXT_EMB_NPZ = IDX_DIR / "text_emb.npz"
+
+@artifact("text_emb", warm=False)
+def text_npz():
+    """구버전 fallback (text_embed*.npy 가 없을 때 / get_abs_emb) – 쓰일 때만 로드"""
+    return np.load(TEXT_EMB_NPZ)                # key = paper_id → (384,)
+
+
+# (3) paper row 정렬 dense 행렬 (04_concat_embed.py 산출) – hop-1 필터를 BLAS 1회로
+@artifact("text_matrix")
+def text_matrix():
+    path = IDX_DIR / "text_embed.npy"
+    return np.load(path, mmap_mode="r") if path.exists() else None
+
+
+# (4) 클러스터 연속 배치 사본 (06_build_index*.py 산출) – 클러스터 = 연속 slab 1개
+@artifact("text_slabs")
+def text_slabs():
+    path = IDX_DIR / "text_embed_clustered.npy"
+    if not path.exists():
+        return None
+    S = np.load(path, mmap_mode="r")
+    return S if len(S) == len(cluster_csr()[1]) else None    # CSR 과 어긋난 사본은 무시
+
+
+def cluster_text(cid: int):
+    """cluster 의 (paper rows, 정규화 텍스트 벡터 (m, 384) float32)"""
+    rows = cluster_rows(cid)
+    S = text_slabs()
+    if S is not None:
+        lo, hi = cluster_span(cid)
+        return rows, np.asarray(S[lo:hi], dtype="float32")
+
+    T = text_matrix()                                       # row 순 → gather
+    if T is not None:
+        return rows, np.asarray(T[rows], dtype="float32")
+
+    # 구버전 indices/ : NPZ 에서 한 편씩 (abstract 임베딩 없는 논문은 제외)
+    ids, npz = paper_ids(), text_npz()
+    keep, vecs = [], []
+    for r in rows:
+        if (p := ids.pid(r)) in npz:
+            keep.append(r)
+            vecs.append(npz[p])
+    if not vecs:
+        return rows[:0], np.zeros((0, 0), dtype="float32")
+    return np.asarray(keep), normalize_rows(np.vstack(vecs))
 
 
 def get_abs_emb(pid: str) -> torch.Tensor:
     """저장된 384-d 벡터를 torch 형태로 반환 (정규화 포함)"""
-    if pid not in text_npz:
+    npz = text_npz()
+    if pid not in npz:
         return None
-    v = text_npz[pid].astype("float32")
+    v = npz[pid].astype("float32")
     v /= np.linalg.norm(v) + 1e-9
     return torch.from_numpy(v)
 
@@ -87,45 +239,126 @@ def get_abs_emb(pid: str) -> torch.Tensor:
 # ──────────────────────────────────────────────────────────
 # 1) 안전한 키워드 추출 함수 (빈 vocab 방어 포함)
 # ----------------------------------------------------------
-def safe_top_keywords(pids, n=8):
-    docs = [_as_text(G.nodes[p].get("abstract", "")).lower()
-            for p in pids if G.has_node(p)]
-    if not docs:
+def _docs(pids) -> list[str]:
+    """그래프에 있는 논문의 abstract (소문자)"""
+    return [t.lower() for t in abstracts().texts(pids) if t is not None]
+
+
+# 사전 계산 TF-IDF (08_build_tfidf.py 산출) → fit 없이 희소 행 argpartition
+@artifact("tfidf", warm=False)
+def tfidf_index():
+    """(tfidf_docs [N, V], cluster_terms [C, V], vocab) – 없으면 None (호출마다 fit 폴백)"""
+    docs, ct, vocab = (IDX_DIR / n for n in ("tfidf_docs", "cluster_terms", "tfidf_vocab"))
+    if not (csr_exists(docs) and csr_exists(ct) and blob_store_exists(vocab)):
+        return None
+    return load_csr(docs), load_csr(ct), BlobStore(vocab)
+
+
+def _tfidf_vectorizer() -> TfidfVectorizer:
+    """폴백용 – 호출마다 새 객체 (fit 상태를 스레드 간 공유하지 않음)"""
+    return TfidfVectorizer(
+        stop_words="english",
+        token_pattern=r"(?u)\b[a-zA-Z]{2,}\b",   # 2글자↑ 영문 단어
+        max_features=40_000,
+    )
+
+
+def _top_terms(row, vocab, n) -> list[str]:
+    """희소 (1, V) 점수 행 → 상위 n 개 term (동점은 뒤쪽 열 먼저, argsort()[::-1] 과 동일)"""
+    row = row.tocsr()
+    data, idx = row.data, row.indices
+    keep = data > 0
+    data, idx = data[keep], idx[keep]
+    if len(data) > n:
+        part = np.argpartition(-data, n - 1)[:n]
+        data, idx = data[part], idx[part]
+    return [vocab[int(idx[i])] for i in np.lexsort((-idx, -data))]
+
+
+def _pid_terms(pids):
+    """pids 의 TF-IDF 합 (1, V) = indicator (1, N) @ tfidf_docs"""
+    X = tfidf_index()[0]
+    ids  = paper_ids()
+    rows = [r for p in pids if (r := ids.row(p)) is not None]
+    ind  = sp.csr_matrix((np.ones(len(rows), dtype=X.dtype),
+                          (np.zeros(len(rows), dtype="int64"), rows)),
+                         shape=(1, X.shape[0]))
+    return ind @ X
+
+
+def cluster_keywords(cid: int, n=8) -> list[str]:
+    """cluster_terms 의 cid 행 → 상위 n 개 (사전 계산본 없으면 top_keywords)"""
+    if (idx := tfidf_index()) is None:
+        return top_keywords(paper_ids().pids(cluster_rows(cid)), n)
+    _, ct, vocab = idx
+    if not 0 <= cid < ct.shape[0]:
         return []
-    try:
-        X = tfidf.fit_transform(docs)
-        if X.shape[1] == 0:
-            raise ValueError
-        sums = np.asarray(X.sum(0)).ravel()
-        kws  = tfidf.get_feature_names_out()
-        return [kws[i] for i in sums.argsort()[::-1][:n]]
-    except ValueError:
-        from collections import Counter
-        words = Counter(w for d in docs for w in d.split() if len(w) > 2)
-        return [w for w,_ in words.most_common(n)]
-
-def _as_text(x):
-    if x is None:
-        return ""
-    if isinstance(x, list):
-        return " ".join(map(str, x))
-    return str(x)
+    return _top_terms(ct[cid], vocab, n)
+
+
+def safe_top_keywords(pids, n=8):
+    if (idx := tfidf_index()) is not None:
+        kws = _top_terms(_pid_terms(pids), idx[2], n)
+        if kws:
+            return kws
+        docs = _docs(pids)                   # vocab 밖 단어뿐 → 빈도 폴백
+    else:
+        docs = _docs(pids)
+        if not docs:
+            return []
+        try:
+            tfidf = _tfidf_vectorizer()
+            X = tfidf.fit_transform(docs)
+            if X.shape[1] == 0:
+                raise ValueError
+            sums = np.asarray(X.sum(0)).ravel()
+            kws  = tfidf.get_feature_names_out()
+            return [kws[i] for i in sums.argsort()[::-1][:n]]
+        except ValueError:
+            pass
+    from collections import Counter
+    words = Counter(w for d in docs for w in d.split() if len(w) > 2)
+    return [w for w,_ in words.most_common(n)]
 
 def contains_kw(abs_txt: str, kw: str) -> bool:
     """word-boundary 포함 (소문자 비교)"""
     return re.search(rf"\b{re.escape(kw.lower())}\b", abs_txt) is not None
 
-tfidf = TfidfVectorizer(
-    stop_words="english",
-    token_pattern=r"(?u)\b[a-zA-Z]{2,}\b",   # 2글자↑ 영문 단어
-    max_features=40_000,
-)
+
+def keyword_postings(kws, pids) -> dict[str, list[str]]:
+    """{kw(소문자): [pid, …]} – contains_kw 판정을 abstract 1회 스캔으로 (Aho–Corasick)"""
+    docs = ((p, t.lower()) for p, t in zip(pids, abstracts().texts(pids)) if t is not None)
+    return KeywordMatcher(kws).postings(docs)
+
+
+# 클러스터 키워드 postings (09_build_kw_postings.py 산출)
+@artifact("kw_postings", warm=False)
+def kw_postings():
+    """(kw_offsets[C+1], CSR [K, N]) – 없거나 meta 와 어긋나면 None"""
+    off_path = IDX_DIR / "kw_postings_offsets.npy"
+    if not (off_path.exists() and csr_exists(IDX_DIR / "kw_postings")):
+        return None
+    off = np.load(off_path)
+    return (off, load_csr(IDX_DIR / "kw_postings")) if len(off) == len(meta()) + 1 else None
+
+
+def keyword_pids(cid: int, kw: str) -> list[str]:
+    """cluster cid 에서 kw 를 포함하는 논문 – 사전 계산 postings → 없으면 즉석 스캔"""
+    kws = meta()[str(cid)]["keywords"]
+    if (kp := kw_postings()) is not None and kw in kws:
+        off, P = kp
+        k = int(off[cid]) + kws.index(kw)
+        return paper_ids().pids(P.indices[P.indptr[k]:P.indptr[k + 1]])
+    return keyword_postings([kw], paper_ids().pids(cluster_rows(cid))).get(kw.lower(), [])
 
 def top_keywords(pids, n=8):
-    docs = [_as_text(G.nodes[p].get("abstract", "")).lower()
-            for p in pids if G.has_node(p)]
+    if (idx := tfidf_index()) is not None:
+        return _top_terms(_pid_terms(pids), idx[2], n)   # token_pattern 이 TOKEN_RE 를 보장
+
+    docs = _docs(pids)
     if not docs:
         return []
+    tfidf = _tfidf_vectorizer()
     try:
         X = tfidf.fit_transform(docs)
     except ValueError:         # empty vocabulary
@@ -147,41 +380,137 @@ COS_TH2 = 0.25   # hop-2 임계값
 
 N_LVL1 = 3      # 1-depth(kw1) 최대 5개
 
-def build_tree(root_kw: str, cid: int, depth: int = 1):
-    c_meta = meta[str(cid)]
+def build_tree(root_kw: str, cid: int, depth: int = 1, cand_embs=None):
+    """cand_embs: meta[cid]["keywords"] 임베딩을 미리 구했으면 전달 (keyword_embs_many)"""
+    with stage("build_tree"):
+        return _build_tree(root_kw, cid, depth, cand_embs)
+
+
+def _build_tree(root_kw, cid, depth, cand_embs):
+    c_meta = meta()[str(cid)]
     cand   = c_meta["keywords"]
     tfidf_dict = dict(zip(
         c_meta["keywords"],
         c_meta.get("tfidf_sums", [])
     ))
-    pids_lvl0 = cluster2pids[cid]
+    # 후보 키워드 임베딩은 사전 계산 행렬에서 → 요청 중 encode 없음
+    if cand_embs is None:
+        cand_embs = keyword_embs(cid, cand)
+    kw_pos    = {kw: i for i, kw in enumerate(cand)}
+    if root_kw in kw_pos:
+        root_emb = cand_embs[kw_pos[root_kw]]
+    else:
+        with stage("keyword_encode"):
+            root_emb = model().encode([root_kw], normalize_embeddings=True)[0]
 
     tree = {"id": root_kw, "value": 1.0, "children": []}
 
     # ── depth-1  (최대 3개) ──────────────────────
-    for kw1, sc1 in select_kw_scored(root_kw, cand, tfidf_dict, k=3):
-        kw1_emb = model.encode([kw1], normalize_embeddings=True)[0]
-
-        hop1 = [
-            p for p in pids_lvl0
-            if (emb := get_abs_emb(p)) is not None
-            and util.cos_sim(kw1_emb, emb).item() > COS_TH1
-        ]
-
+    with stage("select_kw_scored"):
+        lvl1 = select_kw_scored(root_kw, cand, tfidf_dict, k=3,
+                                cand_embs=cand_embs, q_emb=root_emb)
+
+    # hop-1: 클러스터 논문 × 선택 키워드 cosine 을 행렬곱 1회로
+    with stage("hop1_scan"):
+        rows_lvl0, text_lvl0 = cluster_text(cid)
+        if lvl1 and len(rows_lvl0):
+            kw1_mat = normalize_rows(np.vstack([cand_embs[kw_pos[kw]] for kw, _ in lvl1]))
+            sims1   = text_lvl0 @ kw1_mat.T                    # (m, |lvl1|)
+        else:
+            sims1   = np.zeros((len(rows_lvl0), len(lvl1)), dtype="float32")
+
+        # 유사도 내림차순 (API 는 앞 N 개만 인라인, 나머지는 페이지로)
+        hop1s = []
+        for j in range(len(lvl1)):
+            sel = np.flatnonzero(sims1[:, j] > COS_TH1)
+            sel = sel[np.argsort(-sims1[sel, j], kind="stable")]
+            hop1s.append(paper_ids().pids(rows_lvl0[sel]))
+
+    # depth-2: 모든 level-1 부모를 공유 후보 행렬 위에서 한 번에 점수화
+    lvl2 = None
+    if depth > 1:
+        with stage("depth2_expand"):
+            lvl2 = select_kw_scored_batch([cand_embs[kw_pos[kw]] for kw, _ in lvl1],
+                                          cand, tfidf_dict, k=3, cand_embs=cand_embs)
+
+    for j, (kw1, sc1) in enumerate(lvl1):
         node1 = {
             "id":      kw1,
             "value":   round(sc1, 4),
-            "pids":    hop1,          # 필요 없으면 제거
+            "pids":    hop1s[j],      # 필요 없으면 제거
         }
 
         # ── depth-2 : parent=kw1, 최대 3개 ───────
         if depth > 1:
-            for kw2, sc2 in select_kw_scored(kw1, cand, tfidf_dict, k=3):
-                node1["children"].append({
-                    "id":    kw2,
-                    "value": round(sc2, 4),
-                })
+            node1["children"] = [{"id": kw2, "value": round(sc2, 4)}
+                                 for kw2, sc2 in lvl2[j]]
 
         tree["children"].append(node1)
 
     return tree
+
+
+# ── 사전 계산 트리 (07_precompute_trees.py 산출) ─────────────
+# 저장소가 없을 때 build_tree 를 클러스터별로 병렬 실행할 워커 수
+TREE_WORKERS = int(os.getenv("TREE_WORKERS", "4"))
+_tree_pool   = ThreadPoolExecutor(max_workers=max(1, TREE_WORKERS),
+                                  thread_name_prefix="build-tree")
+
+@artifact("cluster_trees")
+def cluster_trees() -> dict:
+    """depth → TreeStore (cluster 수가 meta 와 다른 옛 저장소는 무시)"""
+    stores = {}
+    for depth in (1, 2):
+        prefix = tree_store_prefix(IDX_DIR, depth)
+        if tree_store_exists(prefix) and len(store := TreeStore(prefix)) == len(meta()):
+            stores[depth] = store
+    return stores
+
+
+def cluster_tree(cid: int, depth: int = 1):
+    """root_kw = keywords[0] 인 클러스터 트리: 저장소 조회 → 없으면 build_tree"""
+    if (store := cluster_trees().get(depth)) is not None:
+        return store.get(cid)
+    kws = meta()[str(cid)]["keywords"]
+    return build_tree(kws[0], cid, depth=depth) if kws else None
+
+
+def iter_cluster_trees(cids, depth: int = 1):
+    """
+    (입력 위치, 트리) 를 완성되는 순서대로 – 스트리밍 응답용.
+    저장소가 있으면 입력 순서 그대로, 없으면 키워드 encode 를 클러스터 간 1회로 묶고
+    build_tree 를 병렬 실행 (행렬곱/encode 는 GIL 을 놓으므로 스레드로 충분).
+    """
+    cids = list(cids)
+    if (store := cluster_trees().get(depth)) is not None:
+        for i, cid in enumerate(cids):
+            with stage("tree_lookup"):
+                tree = store.get(cid)
+            yield i, tree
+        return
+
+    pos = {}                                        # cid → 입력 위치들 (중복 cid 는 1번만 빌드)
+    for i, cid in enumerate(cids):
+        pos.setdefault(cid, []).append(i)
+    for cid in [c for c in pos if not meta()[str(c)]["keywords"]]:
+        for i in pos.pop(cid):
+            yield i, None
+
+    embs = keyword_embs_many(pos)
+    futs = {_tree_pool.submit(build_tree, meta()[str(cid)]["keywords"][0], cid,
+                              depth, embs[cid]): cid
+            for cid in pos}
+    for f in as_completed(futs):
+        tree = f.result()
+        for k, i in enumerate(pos[futs[f]]):
+            # 같은 cid 가 두 번 나와도 호출자가 독립적으로 고칠 수 있게 복사
+            yield i, tree if k == 0 else copy.deepcopy(tree)
+
+
+def cluster_tree_list(cids, depth: int = 1) -> list:
+    """여러 cluster_tree 를 입력 순서대로 (지연 ≈ 가장 느린 클러스터)"""
+    cids  = list(cids)
+    trees = [None] * len(cids)
+    for i, tree in iter_cluster_trees(cids, depth):
+        trees[i] = tree
+    return trees
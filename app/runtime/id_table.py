@@ -0,0 +1,74 @@
+# runtime/id_table.py
+"""
+paper_id ↔ row 레지스트리 (pickle dict 대체, mmap 공유)
+
+  <prefix>.blob / <prefix>.offsets.npy   – row 순서의 paper_id 문자열 (BlobStore)
+  <prefix>.sorted.npy                    – int32 [n] paper_id 바이트 사전순으로 정렬한 row
+
+  row → pid : O(1)       (offsets 슬라이스)
+  pid → row : O(log n)   (sorted 순열 위 이진 탐색)
+"""
+import pathlib
+import numpy as np
+
+from runtime.blob_store import BlobStore, blob_store_exists, write_blob_store
+
+
+def _sorted_path(prefix):
+    prefix = pathlib.Path(prefix)
+    return prefix.with_name(prefix.name + ".sorted.npy")
+
+
+def write_id_table(prefix, pids) -> int:
+    """pids[row] = paper_id 리스트 → 파일 3개"""
+    pids = [str(p) for p in pids]
+    keys = [p.encode("utf-8") for p in pids]
+    if len(set(keys)) != len(keys):
+        raise ValueError("duplicate paper ids")
+
+    n = write_blob_store(prefix, keys)
+    order = sorted(range(n), key=keys.__getitem__)
+    np.save(_sorted_path(prefix), np.asarray(order, dtype="int32"))
+    return n
+
+
+def id_table_exists(prefix) -> bool:
+    return blob_store_exists(prefix) and _sorted_path(prefix).exists()
+
+
+class IdTable:
+    def __init__(self, prefix):
+        self._store  = BlobStore(prefix)
+        self._sorted = np.load(_sorted_path(prefix), mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def pid(self, row: int) -> str:
+        return self._store[int(row)]
+
+    def pids(self, rows) -> list[str]:
+        return [self._store[int(r)] for r in rows]
+
+    def row(self, pid: str, default=None):
+        """paper_id → row (없으면 default)"""
+        key = pid.encode("utf-8")
+        lo, hi = 0, len(self._sorted)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._store.get_bytes(int(self._sorted[mid])) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._sorted):
+            r = int(self._sorted[lo])
+            if self._store.get_bytes(r) == key:
+                return r
+        return default
+
+    def rows(self, pids) -> np.ndarray:
+        """없는 pid 는 -1"""
+        return np.asarray([self.row(p, -1) for p in pids], dtype="int64")
+
+    def __contains__(self, pid: str) -> bool:
+        return self.row(pid) is not None
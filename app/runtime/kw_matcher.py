@@ -0,0 +1,89 @@
+# runtime/kw_matcher.py
+"""
+다중 키워드 매처 (Aho–Corasick, word-boundary)
+
+graph_builder.contains_kw 와 같은 판정 – re.search(rf"\b{kw}\b", abstract.lower()) –
+을 키워드 전체에 대해 abstract 1회 스캔으로 수행한다.
+  (키워드 수 × 논문 수) 번의 regex 컴파일/검색 → 문자 수에 비례하는 1 pass
+
+경계 규칙은 re 의 \b 그대로: 매치 [i, j) 의 양 끝에서
+  is_word(text[i-1]) != is_word(text[i])   그리고   is_word(text[j-1]) != is_word(text[j])
+(범위 밖 문자는 non-word, is_word = 유니코드 영숫자 또는 '_')
+"""
+from collections import deque
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(k.lower() for k in keywords if k))
+
+        # trie: goto[state] = {문자: state}, out[state] = 이 상태에서 끝나는 키워드 번호
+        self._goto = [{}]
+        self._out  = [[]]
+        for ki, kw in enumerate(self.keywords):
+            s = 0
+            for ch in kw:
+                nxt = self._goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[s][ch] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                s = nxt
+            self._out[s].append(ki)
+
+        # failure link (BFS) – out 은 failure 체인의 출력까지 합쳐 둔다
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, nxt in self._goto[s].items():
+                f = self._fail[s]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _scan(self, text: str):
+        """(키워드 번호, 끝 위치 j) – 경계 검사 전"""
+        goto, fail, out = self._goto, self._fail, self._out
+        s = 0
+        for j, ch in enumerate(text, 1):
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            for ki in out[s]:
+                yield ki, j
+
+    def find(self, text: str):
+        """word-boundary 를 만족하는 매치 [(keyword, start, end), …] (text 는 소문자화)"""
+        text = text.lower()
+        n, hits = len(text), []
+        for ki, j in self._scan(text):
+            kw = self.keywords[ki]
+            i  = j - len(kw)
+            left  = _is_word(text[i - 1]) if i > 0 else False
+            right = _is_word(text[j])     if j < n else False
+            if left != _is_word(text[i]) and _is_word(text[j - 1]) != right:
+                hits.append((kw, i, j))
+        return hits
+
+    def matches(self, text: str) -> set[str]:
+        """text 에 포함된 키워드 집합"""
+        return {kw for kw, _, _ in self.find(text)}
+
+    def postings(self, docs) -> dict[str, list]:
+        """docs = (doc_id, text) 반복자 → {keyword: [doc_id, …]} (문서 순서 유지)"""
+        post = {kw: [] for kw in self.keywords}
+        for doc_id, text in docs:
+            for kw in self.matches(text):
+                post[kw].append(doc_id)
+        return post
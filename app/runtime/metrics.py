@@ -0,0 +1,174 @@
+# runtime/metrics.py
+"""
+Prometheus text format 메트릭 (의존성 없는 최소 구현)
+
+  • Counter / Gauge / Histogram   – 라벨 지원, 스레드 안전
+  • CallbackMetric                – 스크레이프 시점에 값을 읽어옴 (batcher / cache / admission 카운터)
+  • stage("faiss_search")         – 구간 지연을 runtime_stage_seconds{stage=…} 히스토그램에 기록
+
+GET /metrics → render()
+"""
+import math, threading, time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: list = []
+_reg_lock = threading.Lock()
+
+
+def _fmt(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    esc = lambda s: str(s).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name, self.help = name, help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        with _reg_lock:
+            _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: labels {sorted(labels)} != {list(self.labelnames)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._values: dict = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        k = self._key(labels)
+        with self._lock:
+            self._values[k] = self._values.get(k, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        k = self._key(labels)
+        with self._lock:
+            self._values[k] = float(value)
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        """with 블록 동안 +1 (in-flight)"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: dict = {}            # key → [bucket counts…, sum, count]
+
+    def observe(self, value: float, **labels):
+        k = self._key(labels)
+        with self._lock:
+            s = self._series.get(k)
+            if s is None:
+                s = self._series[k] = [0] * len(self.buckets) + [0.0, 0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    s[i] += 1                # 누적은 출력 시
+                    break
+            s[-2] += value
+            s[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, list(s)) for k, s in self._series.items())
+        out = []
+        for k, s in items:
+            cum = 0
+            for b, c in zip(self.buckets, s):
+                cum += c
+                out.append(f"{self.name}_bucket"
+                           f"{_labels(self.labelnames, k, [('le', _fmt(b))])} {cum}")
+            out.append(f"{self.name}_sum{_labels(self.labelnames, k)} {_fmt(s[-2])}")
+            out.append(f"{self.name}_count{_labels(self.labelnames, k)} {s[-1]}")
+        return out
+
+
+class CallbackMetric(_Metric):
+    """fn() → 값 또는 {라벨값 튜플: 값} – 기존 stats() 카운터를 그대로 노출"""
+
+    def __init__(self, name, help, fn, type="gauge", labelnames=()):
+        super().__init__(name, help, labelnames)
+        self.type, self._fn = type, fn
+
+    def samples(self) -> list[str]:
+        try:
+            v = self._fn()
+        except Exception:                   # 아직 로드 전 등 → 이번 스크레이프는 생략
+            return []
+        if not isinstance(v, dict):
+            v = {(): v}
+        return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(x)}"
+                for k, x in sorted(v.items())]
+
+
+def render() -> str:
+    with _reg_lock:
+        metrics = list(_registry)
+    lines = []
+    for m in metrics:
+        lines += m.header() + m.samples()
+    return "\n".join(lines) + "\n"
+
+
+# ── 공용 메트릭 ────────────────────────────────────────────
+STAGE_SECONDS = Histogram("runtime_stage_seconds",
+                          "Latency of runtime pipeline stages", ("stage",))
+
+
+def stage(name: str):
+    """with stage("faiss_search"): …  → runtime_stage_seconds{stage="faiss_search"}"""
+    return STAGE_SECONDS.time(stage=name)
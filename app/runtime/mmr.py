@@ -0,0 +1,56 @@
+# runtime/mmr.py
+"""
+행렬 기반 MMR(Maximal Marginal Relevance) 선택
+
+graph_builder 의 기존 루프와 동일한 규칙:
+  • 매 라운드 현재 점수가 가장 높은 후보를 선택 (동점이면 키워드 사전순으로 큰 쪽)
+  • 선택 후 남은 후보 점수 -= λ · max_{선택된 s} cos(후보, s)   (라운드마다 누적)
+
+후보 간 유사도는 선택된 후보의 행만 필요하다 (k·n). 여러 번 재사용할 때는
+(n, n) 행렬을 미리 넘기고, 아니면 정규화 임베딩을 넘겨 행을 그때그때 계산한다.
+선택 집합과의 max 유사도 벡터는 증분 갱신한다.
+
+유사도는 row_dots 로 계산한다: BLAS 행렬곱은 같은 행이라도 위치/배치 크기에 따라
+마지막 비트가 달라져 동점 (중복 키워드 임베딩) 판정이 호출 방식마다 흔들린다.
+"""
+import numpy as np
+
+
+def normalize_rows(x) -> np.ndarray:
+    x = np.asarray(x, dtype="float32")
+    return x / np.maximum(np.linalg.norm(x, axis=-1, keepdims=True), 1e-8)
+
+
+def row_dots(a, b) -> np.ndarray:
+    """a (…, d) · b (n, d) → (…, n) 내적 – 같은 두 행이면 어디서 계산해도 같은 값"""
+    return (np.asarray(a)[..., None, :] * np.asarray(b)).sum(axis=-1)
+
+
+def mmr_select(base, k: int, lam: float,
+               pair_sim=None, embs=None, keys=None):
+    """
+    base      – (n,)   후보별 초기 점수
+    pair_sim  – (n, n) 후보 간 cosine 유사도  (또는)
+    embs      – (n, d) 정규화 후보 임베딩 → 필요한 행만 row_dots(embs[i], embs)
+    keys      – 동점 처리용 후보 키(키워드), 없으면 앞쪽 인덱스
+    반환: [(후보 인덱스, 선택 시점 점수), …]
+    """
+    cur    = np.asarray(base, dtype="float64").copy()
+    n      = len(cur)
+    alive  = np.ones(n, dtype=bool)
+    maxsim = np.full(n, -np.inf)
+    out    = []
+
+    for _ in range(min(k, n)):
+        masked = np.where(alive, cur, -np.inf)
+        ties   = np.flatnonzero(masked == masked.max())
+        best   = (int(ties[0]) if keys is None or len(ties) == 1
+                  else int(max(ties, key=lambda j: keys[j])))
+        out.append((best, float(cur[best])))
+        alive[best] = False
+
+        # diversity 보정: 선택 집합과의 max 유사도만 증분 갱신
+        row    = pair_sim[best] if pair_sim is not None else row_dots(embs[best], embs)
+        maxsim = np.maximum(maxsim, row)
+        cur   -= lam * maxsim
+    return out
@@ -0,0 +1,65 @@
+# runtime/query_cache.py
+"""
+정규화된 쿼리 텍스트 → 쿼리 벡터 LRU/TTL 캐시 (thread-safe)
+"""
+import threading, time, unicodedata
+from collections import OrderedDict
+
+
+def normalize_query(text: str) -> str:
+    """유니코드(NFKC) + 대소문자(casefold) + 공백 정규화"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(text.split())
+
+
+class QueryCache:
+    """
+    capacity  – 최대 항목 수 (0 이면 캐시 끔)
+    ttl       – 항목 유효 시간(초), 0 이면 만료 없음
+    """
+
+    def __init__(self, capacity: int = 4096, ttl: float = 3600.0):
+        self.capacity = max(0, int(capacity))
+        self.ttl      = max(0.0, float(ttl))
+        self._data    = OrderedDict()          # key → (expires_at, value)
+        self._lock    = threading.Lock()
+        self.hits     = 0
+        self.misses   = 0
+
+    def get(self, key: str):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or (self.ttl and item[0] < now):
+                if item is not None:           # 만료 → 제거
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)        # LRU 갱신
+            self.hits += 1
+            return item[1]
+
+    def put(self, key: str, value):
+        if not self.capacity:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "capacity": self.capacity,
+                "ttl_s":    self.ttl,
+                "size":     len(self._data),
+                "hits":     self.hits,
+                "misses":   self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,43 @@
+# runtime/sparse_store.py
+"""
+CSR 희소 행렬 저장소 (scipy save_npz 대체, mmap 으로 열기)
+
+  <prefix>.data.npy / .indices.npy / .indptr.npy   – CSR 배열 그대로
+  <prefix>.shape.npy                               – int64 [2]
+
+save_npz 는 압축 zip 이라 로드 때마다 전체 해제 → 여기선 배열을 mmap 한 채
+csr_matrix 로 감싸기만 한다 (복사 없음, 워커 간 page cache 공유).
+"""
+import pathlib
+import numpy as np
+import scipy.sparse as sp
+
+_PARTS = ("data", "indices", "indptr", "shape")
+
+
+def _paths(prefix) -> dict:
+    prefix = pathlib.Path(prefix)
+    return {part: prefix.with_name(f"{prefix.name}.{part}.npy") for part in _PARTS}
+
+
+def save_csr(prefix, X) -> None:
+    X = sp.csr_matrix(X)
+    X.sort_indices()
+    paths = _paths(prefix)
+    paths["data"].parent.mkdir(parents=True, exist_ok=True)
+    np.save(paths["data"],    X.data)
+    np.save(paths["indices"], X.indices)
+    np.save(paths["indptr"],  X.indptr)
+    np.save(paths["shape"],   np.asarray(X.shape, dtype="int64"))
+
+
+def csr_exists(prefix) -> bool:
+    return all(p.exists() for p in _paths(prefix).values())
+
+
+def load_csr(prefix) -> sp.csr_matrix:
+    paths = _paths(prefix)
+    arr   = {part: np.load(paths[part], mmap_mode="r") for part in _PARTS[:3]}
+    shape = tuple(int(s) for s in np.load(paths["shape"]))
+    return sp.csr_matrix((arr["data"], arr["indices"], arr["indptr"]),
+                         shape=shape, copy=False)
@@ -0,0 +1,46 @@
+# runtime/tree_store.py
+"""
+클러스터별 키워드 트리 사전 계산 저장소 (07_precompute_trees.py 산출)
+
+  <prefix>.blob / <prefix>.offsets.npy   – 레코드 cid = build_tree(keywords[0], cid, depth) JSON
+                                           (빈 레코드 = 키워드 없는 클러스터)
+  prefix = indices/cluster_trees_d{depth}
+
+/inference 의 트리는 쿼리와 무관 (root_kw = meta[cid]["keywords"][0]) →
+런타임은 JSON 디코드 1회로 끝나고 encode / hop-1 스캔이 없다.
+"""
+import json
+import pathlib
+
+from runtime.blob_store import BlobStore, blob_store_exists, write_blob_store
+
+
+def tree_store_prefix(idx_dir, depth: int) -> pathlib.Path:
+    return pathlib.Path(idx_dir) / f"cluster_trees_d{depth}"
+
+
+def write_tree_store(prefix, trees) -> int:
+    """trees[cid] = dict | None 반복자 → 파일 2개, 레코드 수 반환"""
+    return write_blob_store(prefix, (
+        b"" if t is None else json.dumps(t, ensure_ascii=False,
+                                         separators=(",", ":")).encode("utf-8")
+        for t in trees))
+
+
+def tree_store_exists(prefix) -> bool:
+    return blob_store_exists(prefix)
+
+
+class TreeStore:
+    def __init__(self, prefix):
+        self._store = BlobStore(prefix)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, cid: int):
+        """cid → 트리 dict (매번 새 객체, 없으면 None)"""
+        if not 0 <= cid < len(self._store):
+            return None
+        raw = self._store.get_bytes(cid)
+        return json.loads(raw) if raw else None
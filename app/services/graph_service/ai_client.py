@@ -0,0 +1,165 @@
+# graph_service/ai_client.py
+"""
+AI 런타임 (/inference) 호출 – 공유 httpx 클라이언트 + 재시도 + circuit breaker
+
+  • 연결 실패 / 타임아웃 / 502·504 (Retry-After 없는 503 포함)
+        → full-jitter 백오프 재시도, 다 실패하면 breaker 실패 1회
+  • 429 / 503 + Retry-After  – 런타임의 load shedding (admission)
+        → 재시도하지 않고 AIOverloaded(retry_after) 로 호출자에게 그대로 전달.
+          런타임은 살아 있으므로 breaker 실패로 세지 않는다.
+  • breaker open / half-open 시험 중  → CircuitOpen(retry_after), 런타임 호출 없음
+
+/inference 는 hop-1 논문을 노드당 앞 HOP1_INLINE 개만 싣고 pid_count / next_cursor 를 준다
+→ 전체 목록은 fetch_hop1_pids 가 /inference/pids 를 끝까지 페이지 조회해 합친다.
+"""
+import asyncio, os, random, time
+from typing import Optional
+
+import httpx
+
+#AI_URL = "http://searchforest-ai:8004/inference"
+#AI_URL = "http://localhost:8004/inference"
+AI_URL             = os.getenv("AI_INFERENCE_URL",
+                               "https://2f7a-165-194-104-91.ngrok-free.app/inference")
+AI_CONNECT_TIMEOUT = float(os.getenv("AI_CONNECT_TIMEOUT", "2"))     # 초
+AI_READ_TIMEOUT    = float(os.getenv("AI_READ_TIMEOUT", "30"))       # 초 (트리 빌드 포함)
+AI_RETRIES         = int(os.getenv("AI_RETRIES", "2"))               # 첫 시도 외 재시도 횟수
+AI_BACKOFF_S       = float(os.getenv("AI_BACKOFF_S", "0.2"))         # 재시도 대기 기준값
+BREAKER_FAILURES   = int(os.getenv("AI_BREAKER_FAILURES", "5"))      # 연속 실패 → open
+BREAKER_COOLDOWN_S = float(os.getenv("AI_BREAKER_COOLDOWN_S", "30")) # open 유지 시간
+
+RETRY_STATUS = {502, 503, 504}            # 일시적 – 재시도 / breaker 실패로 집계
+SHED_STATUS  = {429, 503}                 # + Retry-After 헤더 → 런타임 load shedding
+PIDS_PAGE    = int(os.getenv("AI_PIDS_PAGE", "500"))   # /inference/pids limit (런타임 최대 500)
+
+# keep-alive 연결 재사용 (graph_service startup 에서 생성, shutdown 에서 close)
+http: Optional[httpx.AsyncClient] = None
+
+
+def open_client() -> httpx.AsyncClient:
+    global http
+    http = httpx.AsyncClient(
+        timeout=httpx.Timeout(AI_READ_TIMEOUT, connect=AI_CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    )
+    return http
+
+
+async def close_client():
+    global http
+    if http:
+        await http.aclose()
+        http = None
+
+
+class CircuitOpen(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"AI runtime circuit open, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class AIOverloaded(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"AI runtime overloaded, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+# ── circuit breaker: 런타임이 죽어 있으면 타임아웃까지 기다리지 않고 즉시 실패 ──────
+class CircuitBreaker:
+    """closed → (연속 실패 N회) → open → (cooldown 후) half-open 시험 1회 → closed / open"""
+
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown_s: float = BREAKER_COOLDOWN_S):
+        self.failures   = failures
+        self.cooldown_s = cooldown_s
+        self.n_failed   = 0
+        self.opened_at: Optional[float] = None
+        self.trial      = False               # half-open 시험 요청 진행 중
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.cooldown_s else "open"
+
+    def before_call(self):
+        state = self.state
+        if state == "open" or (state == "half-open" and self.trial):
+            raise CircuitOpen(max(0.0, self.cooldown_s - (time.monotonic() - self.opened_at)))
+        if state == "half-open":
+            self.trial = True
+
+    def record_success(self):
+        self.n_failed, self.opened_at, self.trial = 0, None, False
+
+    def record_failure(self):
+        self.n_failed += 1
+        self.trial = False
+        if self.opened_at is not None or self.n_failed >= self.failures:
+            self.opened_at = time.monotonic()      # (재)open
+
+    def release(self):
+        """결과 없이 끝난 호출 (취소) – half-open 시험권만 반납, 상태는 그대로"""
+        self.trial = False
+
+
+breaker = CircuitBreaker()
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After (초) – 없거나 HTTP-date 형식이면 None"""
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+async def _get_with_retries(url: str, params: dict) -> httpx.Response:
+    last: Optional[Exception] = None
+    for attempt in range(AI_RETRIES + 1):
+        if attempt:
+            # full jitter: [0, base·2^n) – 재시도가 한꺼번에 몰리지 않게
+            await asyncio.sleep(random.uniform(0, AI_BACKOFF_S * 2 ** attempt))
+        try:
+            response = await http.get(url, params=params)
+        except httpx.TransportError as e:          # 연결 실패 / 타임아웃
+            last = e
+            continue
+        if response.status_code in SHED_STATUS and _retry_after(response) is not None:
+            return response                        # 런타임이 정한 대기 시간 – 여기서 재시도 안 함
+        if response.status_code in RETRY_STATUS:
+            last = httpx.HTTPStatusError(f"AI runtime returned {response.status_code}",
+                                         request=response.request, response=response)
+            continue
+        return response
+    raise last
+
+
+async def ai_get(params: dict, path: str = "") -> dict:
+    """AI 런타임 GET (AI_URL + path) – 공유 클라이언트, 일시적 오류는 jitter 백오프 재시도, breaker 적용"""
+    breaker.before_call()
+    try:
+        response = await _get_with_retries(AI_URL + path, params)
+    except Exception:
+        breaker.record_failure()
+        raise
+    except BaseException:                          # 클라이언트가 끊겨 취소 등
+        breaker.release()
+        raise
+    breaker.record_success()                       # 4xx / shedding 도 런타임은 살아 있음
+
+    retry_after = _retry_after(response)
+    if response.status_code in SHED_STATUS and retry_after is not None:
+        raise AIOverloaded(retry_after)
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_hop1_pids(cid: int, node: dict) -> list:
+    """level-1 노드의 전체 hop-1 pids – 인라인 분 + next_cursor 가 있으면 /inference/pids 페이지"""
+    pids, cursor = list(node.get("pids", [])), node.get("next_cursor")
+    while cursor:
+        page = await ai_get({"cid": cid, "kw": node["id"], "cursor": cursor,
+                             "limit": PIDS_PAGE}, path="/pids")
+        pids.extend(page["pids"])
+        cursor = page["next_cursor"]
+    return pids
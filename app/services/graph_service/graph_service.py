@@ -1,11 +1,13 @@
 import os
-import json, hashlib
+import asyncio, json, hashlib, math
 from typing import List, Dict, Optional, Tuple, Union
 from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel
 import aioredis
-import requests
+import httpx
 from tree_mapping import extract_tree_mapping
+import ai_client
+from ai_client import AIOverloaded, CircuitOpen, ai_get, fetch_hop1_pids
 
 # ────────────────────────────────────────────────────────────────
 app = FastAPI(title="Graph Service with AI Inference")
@@ -35,6 +37,7 @@ class GraphResponse(BaseModel):
 @app.on_event("startup")
 async def startup_event():
     global redis
+    ai_client.open_client()
     # modern aioredis uses from_url
     try:
         redis = await aioredis.from_url(
@@ -50,7 +53,9 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    await redis.close()
+    await ai_client.close_client()
+    if redis:
+        await redis.close()
 
 # 캐시 키 생성 함수
 def make_cache_key( root: str, top1: int, top2: int) -> str:
@@ -60,14 +65,9 @@ def make_cache_key( root: str, top1: int, top2: int) -> str:
 
 
 # AI 서버 호출 함수
-def fetch_keywords(query: str) -> list[str]:
+async def fetch_keywords(query: str) -> list[str]:
     try:
-        response = requests.get(
-            "https://2f7a-165-194-104-91.ngrok-free.app/inference"
-            params={"query": query, "top_k": 5}
-        )
-        response.raise_for_status()
-        data = response.json()
+        data = await ai_get({"query": query, "top_k": 5})
         keywords = [child["kw"] for child in data["results"]["children"]]
         return keywords
     except Exception as e:
@@ -77,13 +77,7 @@ def fetch_keywords(query: str) -> list[str]:
 # AI 서버 호출 + 결과 캐싱
 async def fetch_from_ai_and_cache(root: str, top1: int, top2: int):
     try:
-        #response = requests.get("http://searchforest-ai:8004/inference", params={"query": root, "top_k": top1})
-        response = requests.get("https://2f7a-165-194-104-91.ngrok-free.app/inference", params={"query": root, "top_k": top1})
-
-        # response = requests.get("http://localhost:8004/inference", params={"query": root, "top_k": top1})
-
-        response.raise_for_status()
-        data = response.json()
+        data = await ai_get({"query": root, "top_k": top1})
 
         tree_data = data["results"]["children"]
 
@@ -98,11 +92,12 @@ async def fetch_from_ai_and_cache(root: str, top1: int, top2: int):
 
         keyword_tree = manual_tree_with_full_values(root, mapping)
 
-        # pids 추출
+        # pids 추출 – 응답에는 앞 HOP1_INLINE 개만 있으므로 next_cursor 가 있으면 끝까지 페이지 조회
         kw2pids = {}
-        for node in tree_data:
-            for child in node["children"]:
-                kw2pids[child["id"]] = child["pids"]
+        children = [(node.get("cid"), child) for node in tree_data for child in node["children"]]
+        lists = await asyncio.gather(*(fetch_hop1_pids(cid, child) for cid, child in children))
+        for (_, child), pids in zip(children, lists):
+            kw2pids[child["id"]] = pids
 
         cache_key = make_cache_key(root, top1, top2)
         if redis:
@@ -125,7 +120,13 @@ async def build_graph(req: GraphRequest):
             obj = json.loads(cached)
             return {"keyword_tree": obj["tree"], "kw2pids": obj["kw2pids"]}
 
-    tree = await fetch_from_ai_and_cache(req.root, req.top1, req.top2)
+    try:
+        tree = await fetch_from_ai_and_cache(req.root, req.top1, req.top2)
+    except (CircuitOpen, AIOverloaded) as e:
+        raise HTTPException(status_code=503, detail=str(e),
+                            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))})
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"AI runtime error: {e}")
     
     root, mapping = extract_tree_mapping(original_json)
     tree = manual_tree_with_full_values(root, mapping)
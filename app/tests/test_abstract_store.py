@@ -0,0 +1,21 @@
+# tests/test_abstract_store.py
+from runtime.abstract_store import AbstractStore, as_text, write_abstract_store
+
+
+def test_as_text_flattens_nested_lists():
+    assert as_text(None) == ""
+    assert as_text(" plain ") == "plain"
+    assert as_text(["a b", "c"]) == "a b c"
+    assert as_text([["a", "b"], ["c"]]) == "a b c"
+
+
+def test_abstract_store_lookup(tmp_path):
+    items = [("102", "weak galerkin"), ("7", [["graph", "nets"]]), ("ghost", None)]
+    assert write_abstract_store(tmp_path / "abstracts", iter(items)) == 3
+
+    store = AbstractStore(tmp_path / "abstracts")
+    assert store.get("7") == "graph nets"
+    assert store.get("ghost") == ""
+    assert store.get("missing", "") == ""
+    assert store.texts(["102", "missing"]) == ["weak galerkin", None]
+    assert [p for p, _ in store.items()] == ["102", "7", "ghost"]
@@ -0,0 +1,86 @@
+# tests/test_admission.py
+import asyncio
+import threading
+
+import pytest
+
+from runtime.admission import AdmissionExecutor, Overloaded
+
+
+def test_rejects_when_workers_and_queue_are_full():
+    gate = threading.Event()
+    ex = AdmissionExecutor(workers=2, max_queue=1)
+
+    async def main():
+        held = [asyncio.ensure_future(ex.run(gate.wait)) for _ in range(3)]
+        await asyncio.sleep(0.05)                   # 2 실행 중 + 1 대기
+        st = ex.stats()
+        assert st["in_flight"] == 2 and st["queue_depth"] == 1
+
+        with pytest.raises(Overloaded):
+            await ex.run(lambda: None)
+
+        gate.set()
+        assert await asyncio.gather(*held) == [True] * 3
+        assert await ex.run(lambda x: x + 1, 41) == 42   # 다시 입장 가능
+
+    asyncio.run(main())
+    st = ex.stats()
+    assert st["admitted"] == 4 and st["rejected"] == 1
+    assert st["in_flight"] == 0 and st["queue_depth"] == 0
+
+
+def test_errors_propagate_and_release_the_slot():
+    ex = AdmissionExecutor(workers=1, max_queue=0)
+
+    def boom():
+        raise ValueError("boom")
+
+    async def main():
+        with pytest.raises(ValueError):
+            await ex.run(boom)
+        assert await ex.run(lambda: "ok") == "ok"
+
+    asyncio.run(main())
+
+
+def test_slot_counts_the_request_not_the_worker_calls():
+    ex = AdmissionExecutor(workers=1, max_queue=1)
+
+    async def main():
+        with ex.slot() as slot, ex.slot():          # 워커 없이 대기 중인 요청 2건
+            with pytest.raises(Overloaded):
+                ex.acquire()
+            # 입장한 요청 안의 call 은 한도 검사 없이 워커에서 실행
+            assert await slot.call(lambda x: x * 2, 21) == 42
+            assert ex.stats()["queue_depth"] == 2
+        assert await ex.run(lambda: "ok") == "ok"   # 반환 후 다시 입장 가능
+
+    asyncio.run(main())
+    st = ex.stats()
+    assert st["admitted"] == 3 and st["rejected"] == 1
+    assert st["in_flight"] == 0 and st["queue_depth"] == 0
+
+
+def test_cancelled_call_keeps_the_slot_until_the_worker_finishes():
+    gate = threading.Event()
+    ex = AdmissionExecutor(workers=1, max_queue=0)
+
+    async def main():
+        slot = ex.acquire()
+        task = asyncio.ensure_future(slot.call(gate.wait))
+        await asyncio.sleep(0.05)
+        task.cancel()                               # 클라이언트 끊김
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        slot.release()
+        with pytest.raises(Overloaded):             # 워커는 아직 실행 중 → 한도 유지
+            ex.acquire()
+
+        gate.set()
+        await asyncio.sleep(0.05)
+        assert await ex.run(lambda: "ok") == "ok"
+
+    asyncio.run(main())
+    st = ex.stats()
+    assert st["in_flight"] == 0 and st["queue_depth"] == 0
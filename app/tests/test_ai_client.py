@@ -0,0 +1,150 @@
+# tests/test_ai_client.py
+import asyncio, time
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+from services.graph_service import ai_client
+from services.graph_service.ai_client import AIOverloaded, CircuitBreaker, CircuitOpen
+
+
+@pytest.fixture
+def runtime(monkeypatch):
+    """ai_client.http → MockTransport. responses 에 응답/예외/코루틴 함수를 순서대로"""
+    calls, responses = [], []
+
+    async def handler(request):
+        calls.append(request)
+        r = responses.pop(0) if len(responses) > 1 else responses[0]
+        if isinstance(r, Exception):
+            raise r
+        if callable(r):
+            return await r()
+        return r
+
+    monkeypatch.setattr(ai_client, "http",
+                        httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(ai_client, "AI_BACKOFF_S", 0.0)
+    monkeypatch.setattr(ai_client, "breaker", CircuitBreaker(failures=2, cooldown_s=30))
+    return calls, responses
+
+
+def ok():
+    return httpx.Response(200, json={"results": {"children": []}})
+
+
+def test_breaker_state_machine():
+    b = CircuitBreaker(failures=2, cooldown_s=30)
+    b.record_failure()
+    assert b.state == "closed"
+    b.record_failure()
+    assert b.state == "open"
+    with pytest.raises(CircuitOpen):
+        b.before_call()
+
+    b.opened_at -= 30                               # cooldown 경과
+    assert b.state == "half-open"
+    b.before_call()                                 # 시험 1회만 통과
+    with pytest.raises(CircuitOpen):
+        b.before_call()
+    b.record_failure()                              # 시험 실패 → 바로 다시 open
+    assert b.state == "open" and not b.trial
+
+    b.opened_at -= 30
+    b.before_call()
+    b.record_success()
+    assert b.state == "closed" and b.n_failed == 0
+
+
+def test_transient_errors_are_retried(runtime, monkeypatch):
+    calls, responses = runtime
+    responses[:] = [httpx.Response(502), httpx.ConnectError("down"),
+                    httpx.Response(503), ok()]     # Retry-After 없는 503 은 일시 오류
+    monkeypatch.setattr(ai_client, "AI_RETRIES", 3)
+    assert asyncio.run(ai_client.ai_get({"query": "q"})) == {"results": {"children": []}}
+    assert len(calls) == 4
+    assert ai_client.breaker.n_failed == 0
+
+
+def test_exhausted_retries_count_one_failure(runtime):
+    calls, responses = runtime
+    responses[:] = [httpx.Response(504)]
+    for n in (1, 2):
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(ai_client.ai_get({}))
+        assert ai_client.breaker.n_failed == n
+    assert len(calls) == 2 * (ai_client.AI_RETRIES + 1)
+
+    with pytest.raises(CircuitOpen):               # open → 런타임 호출 없음
+        asyncio.run(ai_client.ai_get({}))
+    assert len(calls) == 2 * (ai_client.AI_RETRIES + 1)
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_load_shedding_is_passed_through_not_retried(runtime, status):
+    calls, responses = runtime
+    responses[:] = [httpx.Response(status, headers={"Retry-After": "3"})]
+    for _ in range(3):
+        with pytest.raises(AIOverloaded) as e:
+            asyncio.run(ai_client.ai_get({}))
+        assert e.value.retry_after == 3
+    assert len(calls) == 3                          # 요청당 1번
+    assert ai_client.breaker.state == "closed" and ai_client.breaker.n_failed == 0
+
+
+def test_cancelled_half_open_trial_releases_the_breaker(runtime):
+    calls, responses = runtime
+    b = ai_client.breaker
+    b.n_failed, b.opened_at = 2, time.monotonic() - 60   # cooldown 지난 open → half-open
+
+    async def hang():
+        await asyncio.sleep(60)
+
+    async def main():
+        responses[:] = [hang]
+        trial = asyncio.ensure_future(ai_client.ai_get({}))
+        await asyncio.sleep(0.01)
+        assert b.trial
+        trial.cancel()                              # 클라이언트 끊김
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        assert b.state == "half-open" and not b.trial
+
+        responses[:] = [ok()]                       # 다음 요청이 시험을 이어받음
+        await ai_client.ai_get({})
+        assert b.state == "closed"
+
+    asyncio.run(main())
+
+
+def test_unexpected_error_in_trial_counts_as_failure(runtime):
+    calls, responses = runtime
+    b = ai_client.breaker
+    b.n_failed, b.opened_at = 2, time.monotonic() - 60
+    responses[:] = [httpx.DecodingError("bad gzip")]
+    with pytest.raises(httpx.DecodingError):
+        asyncio.run(ai_client.ai_get({}))
+    assert b.state == "open" and not b.trial and len(calls) == 1
+
+
+def test_truncated_hop1_list_is_paged_to_the_end(runtime, monkeypatch):
+    calls, responses = runtime
+    monkeypatch.setattr(ai_client, "PIDS_PAGE", 2)
+    responses[:] = [httpx.Response(200, json={"pids": ["p2", "p3"], "next_cursor": "4"}),
+                    httpx.Response(200, json={"pids": ["p4"], "next_cursor": None})]
+    node = {"id": "graph neural network", "pids": ["p0", "p1"],    # 인라인 분만
+            "pid_count": 5, "next_cursor": "2"}
+
+    assert asyncio.run(ai_client.fetch_hop1_pids(7, node)) == ["p0", "p1", "p2", "p3", "p4"]
+    assert all(c.url.path.endswith("/inference/pids") for c in calls)
+    assert [dict(c.url.params) for c in calls] == [
+        {"cid": "7", "kw": "graph neural network", "cursor": "2", "limit": "2"},
+        {"cid": "7", "kw": "graph neural network", "cursor": "4", "limit": "2"}]
+
+
+def test_complete_hop1_list_needs_no_extra_request(runtime):
+    calls, _ = runtime
+    node = {"id": "kw", "pids": ["p0"], "pid_count": 1, "next_cursor": None}
+    assert asyncio.run(ai_client.fetch_hop1_pids(7, node)) == ["p0"]
+    assert asyncio.run(ai_client.fetch_hop1_pids(None, {"id": "kw", "pids": ["p0"]})) == ["p0"]
+    assert calls == []
@@ -0,0 +1,33 @@
+# tests/test_artifacts.py
+import threading
+
+from runtime import artifacts
+from runtime.artifacts import artifact
+
+
+def test_artifact_loads_once_and_warm_up_reports_timings():
+    calls = []
+
+    @artifact("test_eager")
+    def eager():
+        calls.append("eager")
+        return {"x": 1}
+
+    @artifact("test_lazy", warm=False)
+    def lazy():
+        calls.append("lazy")
+        return [1, 2, 3]
+
+    timings = artifacts.warm_up(["test_eager"])
+    assert set(timings) == {"test_eager"}
+    assert artifacts.is_loaded("test_eager")
+    assert not artifacts.is_loaded("test_lazy")
+
+    # 동시 접근해도 로더는 1회만 실행
+    ts = [threading.Thread(target=lazy) for _ in range(8)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    assert eager() == {"x": 1} and lazy() == [1, 2, 3]
+    assert calls == ["eager", "lazy"]
@@ -0,0 +1,48 @@
+# tests/test_batcher.py
+import threading
+
+from runtime.batcher import MicroBatcher
+
+
+def test_concurrent_requests_are_batched_and_scattered():
+    calls = []
+
+    def batch_fn(queries, topk):
+        calls.append(list(queries))
+        return [[(q, rank) for rank in range(topk)] for q in queries]
+
+    b = MicroBatcher(batch_fn, max_size=4, max_wait_ms=200)
+    out = {}
+
+    def worker(i):
+        out[i] = b.search(f"q{i}", topk=2 + i % 2)
+
+    ts = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+
+    # 각 호출자는 자기 쿼리 결과를 자기 top_k 만큼 받는다
+    for i, hits in out.items():
+        assert hits == [(f"q{i}", r) for r in range(2 + i % 2)]
+
+    # 8개 요청이 max_size=4 이하 배치로 묶임
+    assert sum(len(c) for c in calls) == 8
+    assert all(len(c) <= 4 for c in calls)
+    st = b.stats()
+    assert st["requests"] == 8 and st["batches"] == len(calls)
+
+
+def test_batch_error_is_propagated_to_every_caller():
+    def batch_fn(queries, topk):
+        raise RuntimeError("boom")
+
+    b = MicroBatcher(batch_fn, max_size=4, max_wait_ms=1)
+    fut = b.submit("q", 3)
+    try:
+        fut.result(timeout=5)
+    except RuntimeError as e:
+        assert str(e) == "boom"
+    else:
+        raise AssertionError("expected RuntimeError")
@@ -0,0 +1,68 @@
+# tests/test_cluster_trees.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+gb = pytest.importorskip("runtime.graph_builder")
+
+META = {"2": {"keywords": ["b", "x"]}, "3": {"keywords": []},
+        "5": {"keywords": ["a"]},      "7": {"keywords": ["c", "y"]}}
+CIDS = [5, 2, 7, 5, 3, 2]                # 중복 cid + 키워드 없는 클러스터
+
+
+@pytest.fixture
+def fake_builder(monkeypatch):
+    """
+    build_tree 를 입력의 역순으로 끝나게 만든 가짜 (7 → 2 → 5).
+    gates 가 비어 있으면 앞 빌드가 끝나면 반환, 채우면 테스트가 gates[cid] 를 set 할 때 반환.
+    """
+    done  = {c: threading.Event() for c in (5, 2, 7)}
+    after = {5: 2, 2: 7, 7: None}        # 5 는 2 가, 2 는 7 이 끝난 뒤 반환
+    gates, calls = {}, []
+
+    def build_tree(root_kw, cid, depth=1, cand_embs=None):
+        calls.append((root_kw, cid, depth, cand_embs))
+        if gates:
+            assert gates[cid].wait(5)
+        elif after[cid] is not None:
+            assert done[after[cid]].wait(5)
+        tree = {"id": root_kw, "value": cid, "children": [{"id": "k", "pids": [str(cid)]}]}
+        done[cid].set()
+        return tree
+
+    monkeypatch.setattr(gb, "meta", lambda: META)
+    monkeypatch.setattr(gb, "cluster_trees", lambda: {})
+    monkeypatch.setattr(gb, "keyword_embs_many", lambda cids: {c: f"emb{c}" for c in cids})
+    monkeypatch.setattr(gb, "build_tree", build_tree)
+    monkeypatch.setattr(gb, "_tree_pool", ThreadPoolExecutor(max_workers=4))
+    return build_tree, calls, gates
+
+
+def test_tree_list_matches_serial_build(fake_builder):
+    build_tree, calls, _ = fake_builder
+    trees = gb.cluster_tree_list(CIDS, depth=1)
+
+    serial = [build_tree(META[str(c)]["keywords"][0], c) if META[str(c)]["keywords"] else None
+              for c in CIDS]
+    assert trees == serial
+    # 중복 cid 는 1번만 빌드, 각자 사전 계산 임베딩을 받음
+    assert sorted(calls[:3]) == [("a", 5, 1, "emb5"), ("b", 2, 1, "emb2"), ("c", 7, 1, "emb7")]
+
+    trees[0]["children"].clear()         # 중복 위치는 독립 사본
+    assert trees[3]["children"] == [{"id": "k", "pids": ["5"]}]
+
+
+def test_iter_yields_in_completion_order(fake_builder):
+    _, _, gates = fake_builder
+    gates.update((c, threading.Event()) for c in (5, 2, 7))
+    gates[7].set()
+    # 위치 → 그 위치를 받은 뒤 끝낼 cid: 7 (위치 2) 뒤에 2, 2 의 두 번째 (위치 5) 뒤에 5
+    release = {2: 2, 5: 5}
+
+    order = []
+    for i, _ in gb.iter_cluster_trees(CIDS, depth=1):
+        order.append(i)
+        if i in release:
+            gates[release[i]].set()
+    assert order == [4, 2, 1, 5, 0, 3]   # 빈 클러스터 → 7 → 2 (×2) → 5 (×2)
@@ -0,0 +1,33 @@
+# tests/test_encoder.py
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+from runtime.encoder import load_encoder
+
+MODEL = "moka-ai/m3e-base"
+TEXTS = ["graph neural network", "finite element method", "protein folding",
+         "reinforcement learning", "그래프 신경망", "weak galerkin method"]
+
+
+@pytest.fixture(scope="module")
+def fp32_emb():
+    try:
+        model = load_encoder(MODEL, "torch", "cpu")
+    except OSError as e:                  # 모델 다운로드 불가 환경
+        pytest.skip(f"model unavailable: {e}")
+    return model.encode(TEXTS, normalize_embeddings=True)
+
+
+def test_int8_cpu_matches_fp32(fp32_emb):
+    int8 = load_encoder(MODEL, "int8")
+    emb  = int8.encode(TEXTS, normalize_embeddings=True)
+    cos  = np.sum(emb * fp32_emb, axis=1)
+    assert cos.min() >= 0.99
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        load_encoder(MODEL, "tensorrt")
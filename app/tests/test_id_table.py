@@ -0,0 +1,25 @@
+# tests/test_id_table.py
+from runtime.blob_store import BlobStore, write_blob_store
+from runtime.id_table import IdTable, write_id_table
+
+
+def test_blob_store_roundtrip(tmp_path):
+    recs = ["weak galerkin", "", "그래프 신경망", "x" * 1000]
+    assert write_blob_store(tmp_path / "abs", recs) == 4
+    store = BlobStore(tmp_path / "abs")
+    assert len(store) == 4
+    assert [store[i] for i in range(4)] == recs
+
+
+def test_id_table_lookup_both_ways(tmp_path):
+    pids = ["102498304", "17", "9", "abc", "1024"]
+    write_id_table(tmp_path / "paper_ids", pids)
+    ids = IdTable(tmp_path / "paper_ids")
+
+    assert len(ids) == len(pids)
+    assert ids.pids(range(len(pids))) == pids
+    for row, pid in enumerate(pids):
+        assert ids.row(pid) == row
+    assert ids.row("missing") is None
+    assert "17" in ids and "18" not in ids
+    assert ids.rows(["abc", "nope", "9"]).tolist() == [3, -1, 2]
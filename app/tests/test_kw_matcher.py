@@ -0,0 +1,32 @@
+# tests/test_kw_matcher.py
+import random
+import re
+
+from runtime.kw_matcher import KeywordMatcher
+
+
+def contains_kw(abs_txt: str, kw: str) -> bool:      # graph_builder.contains_kw 와 동일
+    return re.search(rf"\b{re.escape(kw.lower())}\b", abs_txt) is not None
+
+
+def test_word_boundaries():
+    m = KeywordMatcher(["graph", "graph neural", "c++", "neural network", "Net"])
+    text = "a graph-based graph neural network beats graphs in c++ net"
+    assert m.matches(text) == {"graph", "graph neural", "neural network", "net"}
+    assert ("graph neural", 14, 26) in m.find(text)
+    assert m.matches("graphs subgraph") == set()
+
+
+def test_matches_regex_semantics_on_random_text():
+    rng, alpha = random.Random(0), "ab _-+.é가1"
+    for _ in range(2000):
+        kws  = ["".join(rng.choice(alpha) for _ in range(rng.randint(1, 4)))
+                for _ in range(rng.randint(1, 6))]
+        text = "".join(rng.choice(alpha) for _ in range(rng.randint(0, 30)))
+        assert KeywordMatcher(kws).matches(text) == {k for k in kws if contains_kw(text, k)}
+
+
+def test_postings_keep_document_order():
+    docs = [("p1", "finite element mesh"), ("p2", "mesh refinement"), ("p3", "element")]
+    post = KeywordMatcher(["mesh", "element", "galerkin"]).postings(docs)
+    assert post == {"mesh": ["p1", "p2"], "element": ["p1", "p3"], "galerkin": []}
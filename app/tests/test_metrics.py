@@ -0,0 +1,45 @@
+# tests/test_metrics.py
+import pytest
+
+from runtime import metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    h = metrics.Histogram("t_hist_seconds", "test", ("stage",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 0.5, 3.0):
+        h.observe(v, stage="a")
+    text = metrics.render()
+    assert 't_hist_seconds_bucket{stage="a",le="0.1"} 1' in text
+    assert 't_hist_seconds_bucket{stage="a",le="1.0"} 3' in text
+    assert 't_hist_seconds_bucket{stage="a",le="+Inf"} 4' in text
+    assert 't_hist_seconds_count{stage="a"} 4' in text
+    assert 't_hist_seconds_sum{stage="a"} 4.05' in text
+
+
+def test_counter_gauge_and_callback():
+    c = metrics.Counter("t_requests_total", "test", ("status",))
+    c.inc(status="200")
+    c.inc(2, status="200")
+    assert c.value(status="200") == 3
+    with pytest.raises(ValueError):
+        c.inc(route="/x")                          # 선언 안 한 라벨
+
+    g = metrics.Gauge("t_in_flight", "test")
+    with g.track():
+        assert g.value() == 1
+    assert g.value() == 0
+
+    metrics.CallbackMetric("t_cache_hits_total", "test", lambda: 7, type="counter")
+    metrics.CallbackMetric("t_broken", "test", lambda: 1 / 0)
+    text = metrics.render()
+    assert "# TYPE t_requests_total counter" in text
+    assert 't_requests_total{status="200"} 3.0' in text
+    assert "t_cache_hits_total 7" in text
+    assert "\nt_broken " not in text               # 읽기 실패 → 샘플 생략
+
+
+def test_stage_timer_records_even_on_error():
+    with pytest.raises(RuntimeError):
+        with metrics.stage("t_failing_stage"):
+            raise RuntimeError
+    assert 'runtime_stage_seconds_count{stage="t_failing_stage"} 1' in metrics.render()
@@ -0,0 +1,78 @@
+# tests/test_mmr.py
+import numpy as np
+import pytest
+
+from runtime.mmr import mmr_select, normalize_rows
+
+LAM = 0.6
+
+
+def legacy_mmr(base, embs, keys, k, lam):
+    """graph_builder.select_kw_scored 의 기존 루프 (정렬 + 스칼라 max)"""
+    scored = [[float(b), kw, e] for b, kw, e in zip(base, keys, embs)]
+    selected, selected_embs = [], []
+    while scored and len(selected) < k:
+        scored.sort(reverse=True, key=lambda x: (x[0], x[1]))
+        best_sc, best_kw, best_emb = scored.pop(0)
+        selected.append((best_kw, best_sc))
+        selected_embs.append(best_emb)
+        scored = [[sc - lam * max(float(e @ se) for se in selected_embs), kw, e]
+                  for sc, kw, e in scored]
+    return selected
+
+
+def test_matches_legacy_loop():
+    rng = np.random.default_rng(0)
+    for n in (1, 2, 5, 20, 60):
+        for _ in range(20):
+            embs = normalize_rows(rng.standard_normal((n, 16)))
+            base = rng.random(n)
+            keys = [f"kw{i:03d}" for i in range(n)]
+
+            picks = mmr_select(base, 5, LAM, pair_sim=embs @ embs.T, keys=keys)
+            got   = [(keys[i], sc) for i, sc in picks]
+            want  = legacy_mmr(base, embs, keys, 5, LAM)
+
+            assert [kw for kw, _ in got] == [kw for kw, _ in want]
+            np.testing.assert_allclose([s for _, s in got], [s for _, s in want],
+                                       rtol=0, atol=1e-6)
+
+
+def test_ties_prefer_larger_keyword_like_legacy_sort():
+    embs = np.eye(3, dtype="float32")
+    base = np.array([0.5, 0.5, 0.1])
+    picks = mmr_select(base, 2, LAM, embs=embs, keys=["apple", "banana", "cherry"])
+    assert [i for i, _ in picks] == [1, 0]
+
+
+def test_batch_matches_per_parent_select_kw_scored():
+    gb = pytest.importorskip("runtime.graph_builder")
+    rng = np.random.default_rng(1)
+    for n in (1, 3, 8, 30):
+        for _ in range(25):
+            # 정수 격자 임베딩 + 중복 행 / 같은 tf → 점수 동점이 자주 생김
+            cand = rng.integers(-2, 3, (n, 8)).astype("float32")
+            cand[rng.random(n) < 0.3] = cand[0]
+            cand[~cand.any(axis=1)] = 1.0
+            parents = rng.integers(-2, 3, (4, 8)).astype("float32")
+            parents[~parents.any(axis=1)] = 1.0
+            parents[3] = cand[0]
+            kws   = [f"kw{i:02d}" for i in range(n)]
+            tfidf = {kw: float(rng.integers(0, 3)) for kw in kws[::2]}
+
+            got  = gb.select_kw_scored_batch(parents, kws, tfidf, k=5, cand_embs=cand)
+            want = [gb.select_kw_scored(None, kws, tfidf, k=5, cand_embs=cand, q_emb=p)
+                    for p in parents]
+
+            assert len(got) == len(want)
+            for g, w in zip(got, want):
+                assert [kw for kw, _ in g] == [kw for kw, _ in w]
+                np.testing.assert_allclose([s for _, s in g], [s for _, s in w],
+                                           rtol=0, atol=1e-6)
+
+
+def test_batch_without_candidates_or_parents():
+    gb = pytest.importorskip("runtime.graph_builder")
+    assert gb.select_kw_scored_batch(np.ones((2, 4)), [], {}) == [[], []]
+    assert gb.select_kw_scored_batch(np.empty((0, 4)), ["a"], {},
+                                     cand_embs=np.ones((1, 4))) == []
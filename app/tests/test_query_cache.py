@@ -0,0 +1,31 @@
+# tests/test_query_cache.py
+import time
+
+from runtime.query_cache import QueryCache, normalize_query
+
+
+def test_normalize_query_folds_case_space_and_unicode():
+    assert normalize_query("  Graph   Neural\tNetworks ") == "graph neural networks"
+    # 전각 문자(NFKC) + ß casefold
+    assert normalize_query("ＧＮＮ") == "gnn"
+    assert normalize_query("Straße") == normalize_query("STRASSE")
+
+
+def test_lru_eviction_and_counters():
+    c = QueryCache(capacity=2, ttl=0)
+    c.put("a", 1)
+    c.put("b", 2)
+    assert c.get("a") == 1          # a 가 최근 사용 → b 가 밀려남
+    c.put("c", 3)
+    assert c.get("b") is None
+    assert c.get("c") == 3
+    st = c.stats()
+    assert (st["hits"], st["misses"], st["size"]) == (2, 1, 2)
+
+
+def test_ttl_expiry():
+    c = QueryCache(capacity=4, ttl=0.01)
+    c.put("a", 1)
+    time.sleep(0.02)
+    assert c.get("a") is None
+    assert c.stats()["size"] == 0
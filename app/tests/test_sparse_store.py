@@ -0,0 +1,21 @@
+# tests/test_sparse_store.py
+import numpy as np
+import scipy.sparse as sp
+
+from runtime.sparse_store import csr_exists, load_csr, save_csr
+
+
+def test_csr_roundtrip_is_mmap_backed(tmp_path):
+    X = sp.random(40, 25, density=0.1, format="csr", dtype="float32", random_state=0)
+    assert not csr_exists(tmp_path / "m")
+    save_csr(tmp_path / "m", X)
+    assert csr_exists(tmp_path / "m")
+
+    Y = load_csr(tmp_path / "m")
+    assert Y.shape == X.shape
+    assert (Y != X).nnz == 0
+    assert not Y.data.flags.owndata            # mmap 배열 view (복사 없음)
+
+    # indicator @ X → 행 합
+    ind = sp.csr_matrix((np.ones(3, "float32"), ([0, 0, 0], [1, 5, 7])), shape=(1, 40))
+    np.testing.assert_allclose((ind @ Y).toarray()[0], X[[1, 5, 7]].sum(0).A1, rtol=1e-6)
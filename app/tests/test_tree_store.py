@@ -0,0 +1,22 @@
+# tests/test_tree_store.py
+from runtime.tree_store import TreeStore, tree_store_prefix, write_tree_store
+
+
+def test_tree_store_roundtrip(tmp_path):
+    trees = [
+        {"id": "weak galerkin", "value": 1.0,
+         "children": [{"id": "mixed", "value": 0.81, "pids": ["17", "9"]}]},
+        None,                                       # 키워드 없는 클러스터
+        {"id": "그래프", "value": 1.0, "children": []},
+    ]
+    prefix = tree_store_prefix(tmp_path, 1)
+    assert write_tree_store(prefix, iter(trees)) == 3
+
+    store = TreeStore(prefix)
+    assert len(store) == 3
+    assert [store.get(c) for c in range(3)] == trees
+    assert store.get(3) is None and store.get(-1) is None
+
+    a = store.get(0)
+    a["sim"] = 0.5                                  # 호출자가 고쳐도 저장본은 그대로
+    assert "sim" not in store.get(0)